@@ -2,36 +2,41 @@
 Console UI for the Inventory Management System
 Author: Sujal (BSc.IT)
 """
-from typing import Optional
+from typing import Iterable, Optional
 from services import InventoryService
+from settings import load_settings, save_settings
 
 # Extra standard library imports for usability features
-import json
 import csv
-import shutil
+import sys
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
-# Settings handling
-SETTINGS_FILE = Path(__file__).with_name("settings.json")
+_UTC = timezone.utc
 
+# Write buffer for CSV exports; large enough that writerows() flushes in big chunks
+EXPORT_BUFFER_SIZE = 1 << 20
 
-def _load_settings() -> dict:
-    if SETTINGS_FILE.exists():
-        try:
-            return json.loads(SETTINGS_FILE.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-    return {}
+# Paths next to this module, computed once
+_MODULE_DIR = Path(__file__).parent
+_EXPORTS_DIR = _MODULE_DIR / "exports"
+_BACKUPS_DIR = _MODULE_DIR / "backups"
+
+# Currency symbol for this process; loaded on first use and updated by _set_currency
+_CURRENCY: Optional[str] = None
 
 
-def _save_settings(settings: dict) -> None:
-    SETTINGS_FILE.write_text(json.dumps(settings, indent=2), encoding="utf-8")
+def _get_currency() -> str:
+    global _CURRENCY
+    if _CURRENCY is None:
+        _CURRENCY = load_settings().get("currency", "₹")
+    return _CURRENCY
 
 
-def _get_currency(settings: Optional[dict] = None) -> str:
-    s = settings if settings is not None else _load_settings()
-    return s.get("currency", "₹")
+def _set_currency(symbol: Optional[str]) -> None:
+    # None drops the cached symbol so the next lookup reads settings again
+    global _CURRENCY
+    _CURRENCY = symbol
 
 
 def prompt_int(message: str, allow_empty: bool = False) -> Optional[int]:
@@ -73,19 +78,21 @@ def confirm(message: str) -> bool:
     return answer in ("y", "yes")
 
 
-def format_currency(value: float) -> str:
-    return f"{_get_currency()}{value:,.2f}"
+# Directories already created this session
+_dir_ready: set[Path] = set()
 
 
 def ensure_dir(path: Path) -> None:
+    if path in _dir_ready:
+        return
     path.mkdir(parents=True, exist_ok=True)
+    _dir_ready.add(path)
 
 
-def export_csv(filename: str, headers: list[str], rows: list[list[object]]) -> Path:
-    export_dir = Path(__file__).with_name("exports")
-    ensure_dir(export_dir)
-    export_path = export_dir / filename
-    with export_path.open("w", newline="", encoding="utf-8") as f:
+def export_csv(filename: str, headers: list[str], rows: Iterable[Iterable[object]]) -> Path:
+    ensure_dir(_EXPORTS_DIR)
+    export_path = _EXPORTS_DIR / filename
+    with export_path.open("w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(headers)
         writer.writerows(rows)
@@ -97,7 +104,9 @@ def parse_date_input(prompt: str) -> Optional[datetime]:
     if raw == "":
         return None
     try:
-        return datetime.strptime(raw, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        # date.fromisoformat only accepts a date (no time part) and is much cheaper than strptime
+        d = date.fromisoformat(raw)
+        return datetime(d.year, d.month, d.day, tzinfo=_UTC)
     except ValueError:
         print("Invalid date format. Use YYYY-MM-DD.")
         return None
@@ -120,22 +129,30 @@ def ask_date_range() -> Optional[tuple[datetime, datetime]]:
 
 
 def print_products(service: InventoryService) -> None:
-    products = service.list_products()
-    print_products_table(products)
+    print_products_table(service.list_products())
+
+
+def write_lines(lines: list[str]) -> None:
+    # One write per table instead of one print() per row
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def print_products_table(products: list[dict]) -> None:
+def print_products_table(products: list[tuple]) -> None:
+    # Rows are (id, name, sku, unit_price, quantity_in_stock, reorder_level) tuples
     if not products:
         print("No products found.")
         return
-    print("ID  | Name                           | SKU           | Price       | Stock | Reorder")
-    print("----+---------------------------------+---------------+-------------+-------+--------")
-    for p in products:
-        price_str = format_currency(float(p['unit_price']))
-        print(
-            f"{p['id']:>3} | {p['name'][:31]:<31} | {str(p['sku'] or '')[:13]:<13} | "
-            f"{price_str:>11} | {p['quantity_in_stock']:>5} | {p['reorder_level']:>6}"
-        )
+    lines = [
+        "ID  | Name                           | SKU           | Price       | Stock | Reorder",
+        "----+---------------------------------+---------------+-------------+-------+--------",
+    ]
+    cur = _get_currency()
+    row_fmt = "{:>3} | {:<31} | {:<13} | {:>11} | {:>5} | {:>6}".format
+    lines.extend(
+        row_fmt(pid, name[:31], str(sku or '')[:13], f"{cur}{float(price):,.2f}", qty, reorder)
+        for pid, name, sku, price, qty, reorder in products
+    )
+    write_lines(lines)
 
 
 def manage_products(service: InventoryService) -> None:
@@ -165,7 +182,8 @@ def manage_products(service: InventoryService) -> None:
                 print(f"Error: {e}")
             pause()
         elif choice == "3":
-            print_products(service)
+            if confirm("List products first?"):
+                print_products(service)
             pid = prompt_int("Product ID to update: ")
             if pid is None:
                 continue
@@ -192,7 +210,8 @@ def manage_products(service: InventoryService) -> None:
                 print(f"Error: {e}")
             pause()
         elif choice == "4":
-            print_products(service)
+            if confirm("List products first?"):
+                print_products(service)
             pid = prompt_int("Product ID to delete: ")
             if pid is None:
                 continue
@@ -208,17 +227,11 @@ def manage_products(service: InventoryService) -> None:
             pause()
         elif choice == "5":
             q = prompt_str("Search by name or SKU (case-insensitive): ", allow_empty=True)
-            all_products = service.list_products()
-            if q:
-                ql = q.lower()
-                filtered = [p for p in all_products if ql in (p['name'] or '').lower() or ql in (p.get('sku') or '').lower()]
-            else:
-                filtered = all_products
+            filtered = service.list_products(q)
             print_products_table(filtered)
             pause()
         elif choice == "6":
-            products = service.list_products()
-            rows = [[p['id'], p['name'], p.get('sku') or '', p.get('description') or '', p['unit_price'], p['quantity_in_stock'], p['reorder_level']] for p in products]
+            rows = ([p['id'], p['name'], p['sku'] or '', p['description'] or '', p['unit_price'], p['quantity_in_stock'], p['reorder_level']] for p in service.iter_products())
             path = export_csv("products.csv", ["id", "name", "sku", "description", "unit_price", "quantity_in_stock", "reorder_level"], rows)
             print(f"Exported to {path}")
             pause()
@@ -233,13 +246,16 @@ def print_suppliers(service: InventoryService) -> None:
     if not suppliers:
         print("No suppliers found.")
         return
-    print("ID  | Name                           | Contact         | Phone         | Email")
-    print("----+---------------------------------+-----------------+---------------+------------------------------")
-    for s in suppliers:
-        print(
-            f"{s['id']:>3} | {s['name'][:31]:<31} | {str(s.get('contact_name') or '')[:15]:<15} | "
-            f"{str(s.get('phone') or '')[:13]:<13} | {str(s.get('email') or '')[:28]:<28}"
-        )
+    lines = [
+        "ID  | Name                           | Contact         | Phone         | Email",
+        "----+---------------------------------+-----------------+---------------+------------------------------",
+    ]
+    lines.extend(
+        f"{sid:>3} | {name[:31]:<31} | {str(contact or '')[:15]:<15} | "
+        f"{str(phone or '')[:13]:<13} | {str(email or '')[:28]:<28}"
+        for sid, name, contact, phone, email, _address in suppliers
+    )
+    write_lines(lines)
 
 
 def manage_suppliers(service: InventoryService) -> None:
@@ -267,7 +283,8 @@ def manage_suppliers(service: InventoryService) -> None:
                 print(f"Error: {e}")
             pause()
         elif choice == "3":
-            print_suppliers(service)
+            if confirm("List suppliers first?"):
+                print_suppliers(service)
             sid = prompt_int("Supplier ID to update: ")
             if sid is None:
                 continue
@@ -294,7 +311,8 @@ def manage_suppliers(service: InventoryService) -> None:
                 print(f"Error: {e}")
             pause()
         elif choice == "4":
-            print_suppliers(service)
+            if confirm("List suppliers first?"):
+                print_suppliers(service)
             sid = prompt_int("Supplier ID to delete: ")
             if sid is None:
                 continue
@@ -311,9 +329,11 @@ def manage_suppliers(service: InventoryService) -> None:
 
 
 def record_purchase(service: InventoryService) -> None:
-    print_products(service)
+    if confirm("List products first?"):
+        print_products(service)
     pid = prompt_int("Product ID: ")
-    print_suppliers(service)
+    if confirm("List suppliers first?"):
+        print_suppliers(service)
     sid = prompt_int("Supplier ID (optional, Enter to skip): ", allow_empty=True)
     qty = prompt_int("Quantity: ")
     cost = prompt_float("Unit cost: ")
@@ -326,7 +346,8 @@ def record_purchase(service: InventoryService) -> None:
 
 
 def record_sale(service: InventoryService) -> None:
-    print_products(service)
+    if confirm("List products first?"):
+        print_products(service)
     pid = prompt_int("Product ID: ")
     qty = prompt_int("Quantity: ")
     price = prompt_float("Unit price: ")
@@ -351,6 +372,8 @@ def reports_menu(service: InventoryService) -> None:
         print("6) Export stock to CSV")
         print("7) Export low stock to CSV")
         print("8) Export sales summary to CSV")
+        print("9) Daily sales totals")
+        print("10) Daily purchase totals")
         print("0) Back")
         choice = input("Choose an option: ").strip()
         if choice == "1":
@@ -361,77 +384,118 @@ def reports_menu(service: InventoryService) -> None:
             if not low:
                 print("No low stock items.")
             else:
-                print("ID  | Name                           | Stock | Reorder")
-                print("----+---------------------------------+-------+--------")
-                for p in low:
-                    print(f"{p['id']:>3} | {p['name'][:31]:<31} | {p['quantity_in_stock']:>5} | {p['reorder_level']:>6}")
+                lines = [
+                    "ID  | Name                           | Stock | Reorder",
+                    "----+---------------------------------+-------+--------",
+                ]
+                row_fmt = "{:>3} | {:<31} | {:>5} | {:>6}".format
+                lines.extend(row_fmt(p.id, p.name[:31], p.quantity_in_stock, p.reorder_level) for p in low)
+                write_lines(lines)
             pause()
         elif choice == "3":
             summary = service.report_sales_summary()
             if not summary:
                 print("No sales yet.")
             else:
-                print("Product                          | Qty Sold | Revenue")
-                print("---------------------------------+----------+---------")
-                for r in summary:
-                    revenue_str = format_currency(float(r['total_revenue'] or 0))
-                    print(f"{r['product_name'][:33]:<33} | {int(r['total_quantity_sold'] or 0):>8} | {revenue_str:>9}")
+                lines = [
+                    "Product                          | Qty Sold | Revenue",
+                    "---------------------------------+----------+---------",
+                ]
+                cur = _get_currency()
+                row_fmt = "{:<33} | {:>8} | {:>9}".format
+                lines.extend(
+                    row_fmt(r['product_name'][:33], r['total_quantity_sold'], f"{cur}{r['total_revenue']:,.2f}")
+                    for r in summary
+                )
+                write_lines(lines)
             pause()
         elif choice == "4":
             rng = ask_date_range()
             if not rng:
                 continue
             start, end = rng
-            sales = service.report_sales_between(start.isoformat(), end.isoformat())
-            if not sales:
+            lines = [
+                "Date & Time (UTC)        | Product                        | Qty | Unit Price  | Customer",
+                "-------------------------+---------------------------------+-----+-------------+------------------",
+            ]
+            cur = _get_currency()
+            row_fmt = "{:<23} | {:<33} | {:>3} | {:>11} | {:<16}".format
+            lines.extend(
+                row_fmt(s['sold_at'][:23], s['product_name'][:33], s['quantity'], f"{cur}{float(s['unit_price']):,.2f}", (s['customer_name'] or '')[:16])
+                for s in service.iter_sales_between(start.isoformat(), end.isoformat())
+            )
+            if len(lines) == 2:
                 print("No sales in this range.")
             else:
-                print("Date & Time (UTC)        | Product                        | Qty | Unit Price  | Customer")
-                print("-------------------------+---------------------------------+-----+-------------+------------------")
-                for s in sales:
-                    price_str = format_currency(float(s['unit_price']))
-                    print(f"{s['sold_at'][:23]:<23} | {s['product_name'][:33]:<33} | {s['quantity']:>3} | {price_str:>11} | {(s.get('customer_name') or '')[:16]:<16}")
+                write_lines(lines)
             pause()
         elif choice == "5":
             rng = ask_date_range()
             if not rng:
                 continue
             start, end = rng
-            purchases = service.report_purchases_between(start.isoformat(), end.isoformat())
-            if not purchases:
+            lines = [
+                "Date & Time (UTC)        | Product                        | Qty | Unit Cost   | Supplier",
+                "-------------------------+---------------------------------+-----+-------------+------------------",
+            ]
+            cur = _get_currency()
+            row_fmt = "{:<23} | {:<33} | {:>3} | {:>11} | {:<16}".format
+            lines.extend(
+                row_fmt(p['purchased_at'][:23], p['product_name'][:33], p['quantity'], f"{cur}{float(p['unit_cost']):,.2f}", (p['supplier_name'] or '')[:16])
+                for p in service.iter_purchases_between(start.isoformat(), end.isoformat())
+            )
+            if len(lines) == 2:
                 print("No purchases in this range.")
             else:
-                print("Date & Time (UTC)        | Product                        | Qty | Unit Cost   | Supplier")
-                print("-------------------------+---------------------------------+-----+-------------+------------------")
-                for p in purchases:
-                    cost_str = format_currency(float(p['unit_cost']))
-                    print(f"{p['purchased_at'][:23]:<23} | {p['product_name'][:33]:<33} | {p['quantity']:>3} | {cost_str:>11} | {(p.get('supplier_name') or '')[:16]:<16}")
+                write_lines(lines)
             pause()
         elif choice == "6":
-            products = service.report_stock_levels()
-            rows = [[p['id'], p['name'], p.get('sku') or '', p['unit_price'], p['quantity_in_stock'], p['reorder_level']] for p in products]
+            rows = ([p['id'], p['name'], p['sku'] or '', p['unit_price'], p['quantity_in_stock'], p['reorder_level']] for p in service.iter_products())
             path = export_csv("stock_levels.csv", ["id", "name", "sku", "unit_price", "quantity_in_stock", "reorder_level"], rows)
             print(f"Exported to {path}")
             pause()
         elif choice == "7":
             low = service.report_low_stock()
-            rows = [[p['id'], p['name'], p.get('sku') or '', p['quantity_in_stock'], p['reorder_level']] for p in low]
+            rows = ([p.id, p.name, p.sku or '', p.quantity_in_stock, p.reorder_level] for p in low)
             path = export_csv("low_stock.csv", ["id", "name", "sku", "quantity_in_stock", "reorder_level"], rows)
             print(f"Exported to {path}")
             pause()
         elif choice == "8":
             summary = service.report_sales_summary()
-            rows = [[r['product_name'], int(r['total_quantity_sold'] or 0), float(r['total_revenue'] or 0.0)] for r in summary]
+            rows = ([r['product_name'], r['total_quantity_sold'], r['total_revenue']] for r in summary)
             path = export_csv("sales_summary.csv", ["product_name", "total_quantity_sold", "total_revenue"], rows)
             print(f"Exported to {path}")
             pause()
+        elif choice in ("9", "10"):
+            rng = ask_date_range()
+            if not rng:
+                continue
+            start, end = rng
+            if choice == "9":
+                days = service.report_sales_daily(start.isoformat(), end.isoformat())
+                title = "Sales | Qty   | Revenue"
+            else:
+                days = service.report_purchases_daily(start.isoformat(), end.isoformat())
+                title = "Buys  | Qty   | Cost"
+            if not days:
+                print("Nothing recorded in this range.")
+            else:
+                lines = [
+                    f"Date (UTC) | {title}",
+                    "-----------+-------+-------+-------------",
+                ]
+                cur = _get_currency()
+                row_fmt = "{:<10} | {:>5} | {:>5} | {:>11}".format
+                lines.extend(row_fmt(day, count, qty, f"{cur}{total:,.2f}") for day, count, qty, total in days)
+                write_lines(lines)
+            pause()
         elif choice == "0":
             return
         else:
             print("Invalid option.")
 
 
-def utilities_menu() -> None:
+def utilities_menu(service: InventoryService) -> None:
     while True:
         print("\n-- Utilities --")
         print("1) Backup database")
@@ -439,26 +503,22 @@ def utilities_menu() -> None:
         print("0) Back")
         choice = input("Choose an option: ").strip()
         if choice == "1":
-            db_file = Path(__file__).with_name("inventory.db")
-            if not db_file.exists():
-                print("Database file not found.")
-                pause()
-                continue
-            backups_dir = Path(__file__).with_name("backups")
-            ensure_dir(backups_dir)
+            ensure_dir(_BACKUPS_DIR)
             timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-            backup_path = backups_dir / f"inventory_{timestamp}.db"
-            shutil.copy2(db_file, backup_path)
+            backup_path = _BACKUPS_DIR / f"inventory_{timestamp}.db"
+            # Backup API rather than a file copy: the file alone misses changes still in the WAL
+            service.backup_database(str(backup_path))
             print(f"Backup created: {backup_path}")
             pause()
         elif choice == "2":
-            settings = _load_settings()
+            settings = load_settings()
             current = settings.get("currency", "₹")
             print(f"Current currency symbol: {current}")
             new_symbol = input("Enter new currency symbol (e.g., ₹, $, €, £): ").strip()
-            if new_symbol:
+            if new_symbol and new_symbol != current:
                 settings["currency"] = new_symbol
-                _save_settings(settings)
+                save_settings(settings)
+                _set_currency(new_symbol)
                 print("Currency updated.")
             else:
                 print("No change.")
@@ -491,7 +551,7 @@ def run(service: InventoryService) -> None:
         elif choice == "5":
             reports_menu(service)
         elif choice == "6":
-            utilities_menu()
+            utilities_menu(service)
         elif choice == "0":
             print("Goodbye!")
             return
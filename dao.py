@@ -2,99 +2,215 @@
 Data Access Layer for the Inventory Management System
 Author: Sujal (BSc.IT)
 """
-from typing import Any, Optional
-from db import Database, utc_now_iso
+import sqlite3
+from typing import Any, Iterator, Optional
+from db import Database, SQL_AS_UTC, SQL_NOW
+
+# Hot-path statements are module constants so every call hands sqlite3 the same SQL text
+# and hits its prepared-statement cache.
+SQL_GET_PRODUCT = "SELECT * FROM products WHERE id = ?"
+# Timestamps come from SQLite (SQL_NOW, trg_products_updated_at) rather than Python per row
+SQL_INSERT_PRODUCT = f"""
+    INSERT INTO products (name, name_lower, sku, description, unit_price, quantity_in_stock, reorder_level, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, 0, ?, {SQL_NOW}, {SQL_NOW})
+"""
+SQL_GET_SUPPLIER = "SELECT * FROM suppliers WHERE id = ?"
+SQL_ADJUST_STOCK = """
+    UPDATE products
+    SET quantity_in_stock = quantity_in_stock + ?
+    WHERE id = ? AND quantity_in_stock + ? >= 0
+"""
+SQL_INSERT_PURCHASE = f"""
+    INSERT INTO purchases (product_id, supplier_id, quantity, unit_cost, purchased_at)
+    VALUES (?, ?, ?, ?, COALESCE({SQL_AS_UTC}, {SQL_NOW}))
+"""
+SQL_INSERT_SALE = f"""
+    INSERT INTO sales (product_id, quantity, unit_price, sold_at, customer_name, notes)
+    VALUES (?, ?, ?, COALESCE({SQL_AS_UTC}, {SQL_NOW}), ?, ?)
+"""
+# Row queries behind the service's list/report methods, in the InventoryService.Product order
+_PRODUCT_ROW_COLUMNS = "id, name, sku, unit_price, quantity_in_stock, reorder_level"
+SQL_LIST_PRODUCT_ROWS = f"""
+    SELECT {_PRODUCT_ROW_COLUMNS}
+    FROM products
+    ORDER BY name_lower
+"""
+SQL_LIST_LOW_STOCK_ROWS = f"""
+    SELECT {_PRODUCT_ROW_COLUMNS}
+    FROM products
+    WHERE quantity_in_stock <= reorder_level
+    ORDER BY name_lower
+"""
+SQL_SEARCH_PRODUCT_ROWS = f"""
+    SELECT {_PRODUCT_ROW_COLUMNS}
+    FROM products
+    WHERE name_lower LIKE ? ESCAPE '\\' OR py_lower(sku) LIKE ? ESCAPE '\\'
+    ORDER BY name_lower
+"""
+SQL_LIST_SUPPLIER_ROWS = """
+    SELECT id, name, contact_name, phone, email, address
+    FROM suppliers
+    ORDER BY name_lower
+"""
+SQL_SALES_SUMMARY = """
+    SELECT p.id AS product_id, p.name AS product_name,
+           r.total_qty AS total_quantity_sold,
+           r.total_revenue AS total_revenue
+    FROM product_sales_rollup r
+    JOIN products p ON p.id = r.product_id
+    WHERE r.sale_count > 0
+    ORDER BY total_revenue DESC
+"""
+
+
+def _update_sql(cache: dict[tuple[str, ...], str], table: str, columns: tuple[str, ...]) -> str:
+    # One UPDATE text per column combination, built on first use
+    sql = cache.get(columns)
+    if sql is None:
+        sql = cache[columns] = f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?"
+    return sql
+
+
+def _like_pattern(token: str) -> str:
+    # Substring pattern for LIKE ... ESCAPE '\' with the token's own wildcards escaped
+    escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 
 class ProductDAO:
     def __init__(self, db: Database) -> None:
         self.db = db
+        self._update_stmts: dict[tuple[str, ...], str] = {}
 
     def create(self, name: str, sku: Optional[str], description: Optional[str], unit_price: float, reorder_level: int) -> int:
-        now = utc_now_iso()
-        return self.db.execute(
-            """
-            INSERT INTO products (name, sku, description, unit_price, quantity_in_stock, reorder_level, created_at, updated_at)
-            VALUES (?, ?, ?, ?, 0, ?, ?, ?)
-            """,
-            (name, sku, description, unit_price, reorder_level, now, now),
+        return self.db.execute(SQL_INSERT_PRODUCT, (name, name.lower(), sku, description, unit_price, reorder_level))
+
+    def create_many(self, rows: list[tuple[str, Optional[str], Optional[str], float, int]]) -> int:
+        """Insert (name, sku, description, unit_price, reorder_level) rows in one transaction."""
+        return self.db.executemany(
+            SQL_INSERT_PRODUCT,
+            [(name, name.lower(), sku, description, unit_price, reorder_level) for name, sku, description, unit_price, reorder_level in rows],
         )
 
     def update(self, product_id: int, **fields: Any) -> None:
         if not fields:
             return
-        fields["updated_at"] = utc_now_iso()
-        columns = ", ".join([f"{key} = ?" for key in fields.keys()])
-        params = list(fields.values()) + [product_id]
-        self.db.execute(f"UPDATE products SET {columns} WHERE id = ?", params)
+        if fields.get("name") is not None:
+            fields["name_lower"] = fields["name"].lower()
+        columns = tuple(sorted(fields))
+        params = [fields[c] for c in columns] + [product_id]
+        self.db.execute(_update_sql(self._update_stmts, "products", columns), params)
 
     def delete(self, product_id: int) -> None:
         self.db.execute("DELETE FROM products WHERE id = ?", (product_id,))
 
-    def list_all(self) -> list[dict[str, Any]]:
-        return self.db.query_all(
+    def list_all(self) -> list[sqlite3.Row]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[sqlite3.Row]:
+        return self.db.iter_query(
             """
             SELECT id, name, sku, description, unit_price, quantity_in_stock, reorder_level, created_at, updated_at
             FROM products
-            ORDER BY name COLLATE NOCASE
+            ORDER BY name_lower
             """
         )
 
-    def get_by_id(self, product_id: int) -> Optional[dict[str, Any]]:
-        return self.db.query_one("SELECT * FROM products WHERE id = ?", (product_id,))
+    def list_all_tuples(self) -> list[tuple]:
+        """(id, name, sku, unit_price, quantity_in_stock, reorder_level) rows for table rendering."""
+        return self.db.query_tuples(SQL_LIST_PRODUCT_ROWS)
+
+    def list_low_stock_tuples(self) -> list[tuple]:
+        """list_all_tuples() rows at or below their reorder level, via idx_products_low_stock_name."""
+        return self.db.query_tuples(SQL_LIST_LOW_STOCK_ROWS)
+
+    def search_tuples(self, token: str) -> list[tuple]:
+        """list_all_tuples() rows whose name or SKU contains token, ignoring case.
+
+        Both sides are folded with Python's lower() (name_lower, py_lower()), since SQLite's LIKE
+        only folds ASCII, so non-ASCII names match the same way as in the GUI's filter.
+        """
+        pattern = _like_pattern(token.lower())
+        return self.db.query_tuples(SQL_SEARCH_PRODUCT_ROWS, (pattern, pattern))
+
+    def get_by_id(self, product_id: int) -> Optional[sqlite3.Row]:
+        return self.db.query_one(SQL_GET_PRODUCT, (product_id,))
 
-    def get_by_name_or_sku(self, token: str) -> Optional[dict[str, Any]]:
+    def get_by_name_or_sku(self, token: str) -> Optional[sqlite3.Row]:
         return self.db.query_one(
             "SELECT * FROM products WHERE name = ? OR sku = ?",
             (token, token),
         )
 
     def adjust_stock(self, product_id: int, delta: int) -> None:
-        product = self.get_by_id(product_id)
-        if product is None:
-            raise ValueError("Product not found")
-        new_qty = int(product["quantity_in_stock"]) + int(delta)
-        if new_qty < 0:
+        delta = int(delta)
+        updated = self.db.execute_rowcount(SQL_ADJUST_STOCK, (delta, product_id, delta))
+        if updated == 0:
+            # Only look the row up again to report which check failed
+            if self.get_by_id(product_id) is None:
+                raise ValueError("Product not found")
             raise ValueError("Insufficient stock")
-        self.update(product_id, quantity_in_stock=new_qty)
+
+    def adjust_stock_many(self, deltas: dict[int, int]) -> None:
+        """Apply summed stock deltas per product in a single transaction."""
+        if not deltas:
+            return
+        try:
+            self.db.executemany(
+                SQL_ADJUST_STOCK,
+                [(int(delta), product_id, int(delta)) for product_id, delta in deltas.items()],
+                require_all=True,
+            )
+        except ValueError:
+            raise ValueError("Insufficient stock or product not found") from None
 
 
 class SupplierDAO:
     def __init__(self, db: Database) -> None:
         self.db = db
+        self._update_stmts: dict[tuple[str, ...], str] = {}
 
     def create(self, name: str, contact_name: Optional[str], phone: Optional[str], email: Optional[str], address: Optional[str]) -> int:
         return self.db.execute(
-            """
-            INSERT INTO suppliers (name, contact_name, phone, email, address, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
+            f"""
+            INSERT INTO suppliers (name, name_lower, contact_name, phone, email, address, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, {SQL_NOW})
             """,
-            (name, contact_name, phone, email, address, utc_now_iso()),
+            (name, name.lower(), contact_name, phone, email, address),
         )
 
     def update(self, supplier_id: int, **fields: Any) -> None:
         if not fields:
             return
-        columns = ", ".join([f"{key} = ?" for key in fields.keys()])
-        params = list(fields.values()) + [supplier_id]
-        self.db.execute(f"UPDATE suppliers SET {columns} WHERE id = ?", params)
+        if fields.get("name") is not None:
+            fields["name_lower"] = fields["name"].lower()
+        columns = tuple(sorted(fields))
+        params = [fields[c] for c in columns] + [supplier_id]
+        self.db.execute(_update_sql(self._update_stmts, "suppliers", columns), params)
 
     def delete(self, supplier_id: int) -> None:
         self.db.execute("DELETE FROM suppliers WHERE id = ?", (supplier_id,))
 
-    def list_all(self) -> list[dict[str, Any]]:
-        return self.db.query_all(
+    def list_all(self) -> list[sqlite3.Row]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[sqlite3.Row]:
+        return self.db.iter_query(
             """
             SELECT id, name, contact_name, phone, email, address, created_at
             FROM suppliers
-            ORDER BY name COLLATE NOCASE
+            ORDER BY name_lower
             """
         )
 
-    def get_by_id(self, supplier_id: int) -> Optional[dict[str, Any]]:
-        return self.db.query_one("SELECT * FROM suppliers WHERE id = ?", (supplier_id,))
+    def list_all_tuples(self) -> list[tuple]:
+        """(id, name, contact_name, phone, email, address) rows for table rendering."""
+        return self.db.query_tuples(SQL_LIST_SUPPLIER_ROWS)
+
+    def get_by_id(self, supplier_id: int) -> Optional[sqlite3.Row]:
+        return self.db.query_one(SQL_GET_SUPPLIER, (supplier_id,))
 
-    def get_by_name(self, name: str) -> Optional[dict[str, Any]]:
+    def get_by_name(self, name: str) -> Optional[sqlite3.Row]:
         return self.db.query_one("SELECT * FROM suppliers WHERE name = ?", (name,))
 
 
@@ -102,16 +218,17 @@ class PurchaseDAO:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def create(self, product_id: int, supplier_id: Optional[int], quantity: int, unit_cost: float, purchased_at_iso: str) -> int:
-        return self.db.execute(
-            """
-            INSERT INTO purchases (product_id, supplier_id, quantity, unit_cost, purchased_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (product_id, supplier_id, quantity, unit_cost, purchased_at_iso),
-        )
+    def create(self, product_id: int, supplier_id: Optional[int], quantity: int, unit_cost: float, purchased_at_iso: Optional[str] = None) -> int:
+        return self.db.execute(SQL_INSERT_PURCHASE, (product_id, supplier_id, quantity, unit_cost, purchased_at_iso))
+
+    def create_many(self, rows: list[tuple[int, Optional[int], int, float, Optional[str]]]) -> int:
+        """Insert (product_id, supplier_id, quantity, unit_cost, purchased_at_iso) rows in one transaction.
 
-    def list_recent(self, limit: int = 50) -> list[dict[str, Any]]:
+        A None timestamp is stamped with the current time by SQLite.
+        """
+        return self.db.executemany(SQL_INSERT_PURCHASE, rows)
+
+    def list_recent(self, limit: int = 50) -> list[sqlite3.Row]:
         return self.db.query_all(
             """
             SELECT p.id, p.product_id, pr.name AS product_name, p.supplier_id, s.name AS supplier_name,
@@ -125,35 +242,53 @@ class PurchaseDAO:
             (limit,),
         )
 
-    def list_between(self, start_iso: str, end_iso: str) -> list[dict[str, Any]]:
-        return self.db.query_all(
-            """
+    def list_between(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
+        return list(self.iter_between(start_iso, end_iso))
+
+    def iter_between(self, start_iso: str, end_iso: str) -> Iterator[sqlite3.Row]:
+        return self.db.iter_query(
+            f"""
             SELECT p.id, p.product_id, pr.name AS product_name, p.supplier_id, s.name AS supplier_name,
                    p.quantity, p.unit_cost, p.purchased_at
             FROM purchases p
             LEFT JOIN products pr ON pr.id = p.product_id
             LEFT JOIN suppliers s ON s.id = p.supplier_id
-            WHERE p.purchased_at BETWEEN ? AND ?
+            WHERE p.purchased_at BETWEEN {SQL_AS_UTC} AND {SQL_AS_UTC}
             ORDER BY p.purchased_at ASC
             """,
             (start_iso, end_iso),
         )
 
+    def summary_between(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
+        """(day, purchase_count, total_quantity, total_cost) per UTC day, aggregated by SQLite."""
+        return self.db.query_all(
+            f"""
+            SELECT substr(purchased_at, 1, 10) AS day, COUNT(*) AS purchase_count,
+                   SUM(quantity) AS total_quantity, SUM(quantity * unit_cost) AS total_cost
+            FROM purchases
+            WHERE purchased_at BETWEEN {SQL_AS_UTC} AND {SQL_AS_UTC}
+            GROUP BY day
+            ORDER BY day
+            """,
+            (start_iso, end_iso),
+        )
+
 
 class SaleDAO:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def create(self, product_id: int, quantity: int, unit_price: float, sold_at_iso: str, customer_name: Optional[str], notes: Optional[str]) -> int:
-        return self.db.execute(
-            """
-            INSERT INTO sales (product_id, quantity, unit_price, sold_at, customer_name, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (product_id, quantity, unit_price, sold_at_iso, customer_name, notes),
-        )
+    def create(self, product_id: int, quantity: int, unit_price: float, sold_at_iso: Optional[str], customer_name: Optional[str], notes: Optional[str]) -> int:
+        return self.db.execute(SQL_INSERT_SALE, (product_id, quantity, unit_price, sold_at_iso, customer_name, notes))
+
+    def create_many(self, rows: list[tuple[int, int, float, Optional[str], Optional[str], Optional[str]]]) -> int:
+        """Insert (product_id, quantity, unit_price, sold_at_iso, customer_name, notes) rows in one transaction.
+
+        A None timestamp is stamped with the current time by SQLite.
+        """
+        return self.db.executemany(SQL_INSERT_SALE, rows)
 
-    def list_recent(self, limit: int = 50) -> list[dict[str, Any]]:
+    def list_recent(self, limit: int = 50) -> list[sqlite3.Row]:
         return self.db.query_all(
             """
             SELECT s.id, s.product_id, p.name AS product_name, s.quantity, s.unit_price, s.sold_at,
@@ -166,28 +301,36 @@ class SaleDAO:
             (limit,),
         )
 
-    def list_between(self, start_iso: str, end_iso: str) -> list[dict[str, Any]]:
-        return self.db.query_all(
-            """
+    def list_between(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
+        return list(self.iter_between(start_iso, end_iso))
+
+    def iter_between(self, start_iso: str, end_iso: str) -> Iterator[sqlite3.Row]:
+        return self.db.iter_query(
+            f"""
             SELECT s.id, s.product_id, p.name AS product_name, s.quantity, s.unit_price, s.sold_at,
                    s.customer_name, s.notes
             FROM sales s
             JOIN products p ON p.id = s.product_id
-            WHERE s.sold_at BETWEEN ? AND ?
+            WHERE s.sold_at BETWEEN {SQL_AS_UTC} AND {SQL_AS_UTC}
             ORDER BY s.sold_at ASC
             """,
             (start_iso, end_iso),
         )
 
-    def sales_summary(self) -> list[dict[str, Any]]:
+    def summary_between(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
+        """(day, sale_count, total_quantity, total_revenue) per UTC day, aggregated by SQLite."""
         return self.db.query_all(
-            """
-            SELECT p.id AS product_id, p.name AS product_name,
-                   SUM(s.quantity) AS total_quantity_sold,
-                   SUM(s.quantity * s.unit_price) AS total_revenue
-            FROM sales s
-            JOIN products p ON p.id = s.product_id
-            GROUP BY p.id, p.name
-            ORDER BY total_revenue DESC
-            """
-        ) 
\ No newline at end of file
+            f"""
+            SELECT substr(sold_at, 1, 10) AS day, COUNT(*) AS sale_count,
+                   SUM(quantity) AS total_quantity, SUM(quantity * unit_price) AS total_revenue
+            FROM sales
+            WHERE sold_at BETWEEN {SQL_AS_UTC} AND {SQL_AS_UTC}
+            GROUP BY day
+            ORDER BY day
+            """,
+            (start_iso, end_iso),
+        )
+
+    def sales_summary(self) -> list[sqlite3.Row]:
+        """Per-product totals from the trigger-maintained rollup; quantities are int, revenue float."""
+        return self.db.query_all(SQL_SALES_SUMMARY)
@@ -1,8 +1,150 @@
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime, timezone
 import sys
 
+# Every stored timestamp is ISO-8601 UTC at millisecond precision with a 'Z' suffix, so they
+# compare correctly as strings
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%fZ"
+# The current time, computed by SQLite itself
+SQL_NOW = f"strftime('{ISO_UTC_FORMAT}', 'now')"
+# A bound ISO-8601 timestamp (any offset, e.g. datetime.isoformat()'s "+00:00") in stored form
+SQL_AS_UTC = f"strftime('{ISO_UTC_FORMAT}', ?)"
+
+# Timestamp columns older versions wrote as datetime.isoformat() ("+00:00" suffix)
+_TIMESTAMP_COLUMNS = {
+    "products": ("created_at", "updated_at"),
+    "suppliers": ("created_at",),
+    "purchases": ("purchased_at",),
+    "sales": ("sold_at",),
+}
+
+# Bump whenever the DDL below changes; init_db skips all schema work once a database is current
+SCHEMA_VERSION = 6
+
+# Rows pulled per fetchmany() call when streaming results
+FETCH_BATCH_SIZE = 1000
+
+# Run as one script each. Tables first, so older databases can get their name_lower column
+# before the indexes on it are built.
+_SCHEMA_TABLES = f"""
+BEGIN;
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    name_lower TEXT,
+    sku TEXT UNIQUE,
+    description TEXT,
+    unit_price REAL NOT NULL DEFAULT 0,
+    quantity_in_stock INTEGER NOT NULL DEFAULT 0,
+    reorder_level INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ({SQL_NOW}),
+    updated_at TEXT NOT NULL DEFAULT ({SQL_NOW})
+);
+CREATE TABLE IF NOT EXISTS suppliers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    name_lower TEXT,
+    contact_name TEXT,
+    phone TEXT,
+    email TEXT,
+    address TEXT,
+    created_at TEXT NOT NULL DEFAULT ({SQL_NOW})
+);
+CREATE TABLE IF NOT EXISTS purchases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    product_id INTEGER NOT NULL,
+    supplier_id INTEGER,
+    quantity INTEGER NOT NULL,
+    unit_cost REAL NOT NULL,
+    purchased_at TEXT NOT NULL DEFAULT ({SQL_NOW}),
+    FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE RESTRICT,
+    FOREIGN KEY (supplier_id) REFERENCES suppliers(id) ON DELETE SET NULL
+);
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    product_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_price REAL NOT NULL,
+    sold_at TEXT NOT NULL DEFAULT ({SQL_NOW}),
+    customer_name TEXT,
+    notes TEXT,
+    FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE RESTRICT
+);
+-- Per-product sales totals, kept current by triggers so the summary report doesn't scan sales
+CREATE TABLE IF NOT EXISTS product_sales_rollup (
+    product_id INTEGER PRIMARY KEY,
+    sale_count INTEGER NOT NULL DEFAULT 0,
+    total_qty INTEGER NOT NULL DEFAULT 0,
+    total_revenue REAL NOT NULL DEFAULT 0
+);
+COMMIT;
+"""
+
+_SCHEMA_OBJECTS = f"""
+BEGIN;
+-- Backfill products the triggers have not seen yet (e.g. a database older than the rollup)
+INSERT OR IGNORE INTO product_sales_rollup (product_id, sale_count, total_qty, total_revenue)
+SELECT product_id, COUNT(*), SUM(quantity), SUM(quantity * unit_price)
+FROM sales
+GROUP BY product_id;
+CREATE TRIGGER IF NOT EXISTS trg_sales_rollup_insert AFTER INSERT ON sales
+BEGIN
+    INSERT INTO product_sales_rollup (product_id, sale_count, total_qty, total_revenue)
+    VALUES (NEW.product_id, 1, NEW.quantity, NEW.quantity * NEW.unit_price)
+    ON CONFLICT(product_id) DO UPDATE SET
+        sale_count = sale_count + 1,
+        total_qty = total_qty + excluded.total_qty,
+        total_revenue = total_revenue + excluded.total_revenue;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sales_rollup_delete AFTER DELETE ON sales
+BEGIN
+    UPDATE product_sales_rollup
+    SET sale_count = sale_count - 1,
+        total_qty = total_qty - OLD.quantity,
+        total_revenue = total_revenue - OLD.quantity * OLD.unit_price
+    WHERE product_id = OLD.product_id;
+END;
+-- Stamp updated_at on every product change unless the UPDATE set it explicitly
+CREATE TRIGGER IF NOT EXISTS trg_products_updated_at AFTER UPDATE ON products
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE products SET updated_at = {SQL_NOW} WHERE id = NEW.id;
+END;
+-- Stock can never go negative, whichever statement changes it. A trigger rather than a CHECK
+-- constraint, since SQLite cannot add a CHECK to an existing table without rebuilding it.
+CREATE TRIGGER IF NOT EXISTS trg_products_stock_nonnegative BEFORE UPDATE OF quantity_in_stock ON products
+WHEN NEW.quantity_in_stock < 0
+BEGIN
+    SELECT RAISE(ABORT, 'Insufficient stock');
+END;
+-- (product_id, <timestamp>) also serves plain product_id lookups
+DROP INDEX IF EXISTS idx_purchases_product_id;
+CREATE INDEX IF NOT EXISTS idx_purchases_product_date ON purchases(product_id, purchased_at);
+DROP INDEX IF EXISTS idx_sales_product_id;
+CREATE INDEX IF NOT EXISTS idx_sales_product_sold ON sales(product_id, sold_at);
+CREATE INDEX IF NOT EXISTS idx_purchases_supplier_date ON purchases(supplier_id, purchased_at);
+-- Partial index in report order: the low-stock report reads only the rows it returns
+DROP INDEX IF EXISTS idx_products_low_stock;
+CREATE INDEX IF NOT EXISTS idx_products_low_stock_name ON products(name_lower) WHERE quantity_in_stock <= reorder_level;
+CREATE INDEX IF NOT EXISTS idx_sales_sold_at ON sales(sold_at);
+CREATE INDEX IF NOT EXISTS idx_purchases_purchased_at ON purchases(purchased_at);
+-- Product search is LIKE '%q%', whose leading wildcard no index can serve
+DROP INDEX IF EXISTS idx_products_name_nocase;
+DROP INDEX IF EXISTS idx_products_sku_nocase;
+CREATE INDEX IF NOT EXISTS idx_products_name_lower ON products(name_lower);
+CREATE INDEX IF NOT EXISTS idx_suppliers_name_lower ON suppliers(name_lower);
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+ANALYZE;
+"""
+
+
+def _py_lower(value):
+    return value.lower() if isinstance(value, str) else value
+
 
 def _get_app_dir() -> Path:
     if getattr(sys, "frozen", False):  # PyInstaller onefile
@@ -10,117 +152,298 @@ def _get_app_dir() -> Path:
     return Path(__file__).parent
 
 
+# Resolved once at import; the app location cannot change while the process runs
+_APP_DIR = _get_app_dir()
+_DEFAULT_DB_PATH = str(_APP_DIR / "inventory.db")
+
+# Filesystem types (from /proc/mounts) where SQLite's WAL shared memory is unreliable
+_NETWORK_FS_TYPES = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "fuse.sshfs", "9p"}
+
+
+def _is_network_path(path: str) -> bool:
+    """Best-effort check for a database on a network share, where WAL must not be used"""
+    path = os.path.abspath(path)
+    if sys.platform == "win32":
+        if path.startswith("\\\\"):  # UNC path
+            return True
+        try:
+            import ctypes
+            drive = os.path.splitdrive(path)[0] + "\\"
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == 4  # DRIVE_REMOTE
+        except Exception:
+            return False
+    # Longest mount point containing the path decides
+    best, fstype = "", ""
+    try:
+        with open("/proc/mounts", encoding="utf-8") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1]
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+                    best, fstype = mount_point, fields[2]
+    except OSError:
+        return False
+    return fstype in _NETWORK_FS_TYPES
+
+
 class Database:
     """Database helper class for SQLite operations"""
     
     def __init__(self, db_path=None):
         # Default to inventory.db in app directory
         if db_path is None:
-            self.db_path = str(_get_app_dir() / "inventory.db")
+            self.db_path = _DEFAULT_DB_PATH
         else:
             self.db_path = db_path
+        # One connection shared by every call, opened lazily. sqlite3 connections are not
+        # thread-safe, so all use goes through the (re-entrant) lock.
+        self._conn = None
+        self._lock = threading.RLock()
+        self._in_transaction = False
 
     def _connect(self):
-        """Create database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Return the shared connection, creating it with row factory and PRAGMAs on first use"""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                # Default is 128; keep every DAO statement prepared. The stdlib driver has no way
+                # to pass SQLITE_PREPARE_PERSISTENT, so the hot statements (the SQL_* constants in
+                # dao.py) rely on this cache rather than on apsw or a C helper, in keeping with
+                # the no-external-dependencies rule.
+                cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            # Python's lower() for SQL, to match name_lower; SQLite's lower() only folds ASCII
+            conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+            self._apply_pragmas(conn)
+            self._conn = conn
+        return self._conn
+
+    @property
+    def conn(self):
+        """The shared connection, opened on first use and kept until close().
+
+        Hold the instance lock (or go through the query methods) while using it.
+        """
+        with self._lock:
+            return self._connect()
+
+    def close(self):
+        """Close the shared connection; the next call reopens it"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self.optimize()
+                except sqlite3.Error:
+                    pass  # housekeeping only (e.g. "database is locked"); closing matters more
+                finally:
+                    self._conn.close()
+                    self._conn = None
+
+    def optimize(self):
+        """Let SQLite refresh planner statistics that have gone stale (cheap when nothing has)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("PRAGMA optimize;")
+
+    def _apply_pragmas(self, conn):
+        """Connection settings; WAL is skipped for in-memory databases and network shares"""
+        if self.db_path != ":memory:" and not _is_network_path(self.db_path):
+            conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA cache_size = -64000;")
+        conn.execute("PRAGMA mmap_size = 268435456;")
+        conn.execute("PRAGMA foreign_keys = ON;")
 
     def init_db(self):
-        """Initialize database tables if they don't exist"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            
-            # Enable foreign keys
-            cursor.execute("PRAGMA foreign_keys = ON;")
-            
-            # Products table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS products (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    sku TEXT UNIQUE,
-                    description TEXT,
-                    unit_price REAL NOT NULL DEFAULT 0,
-                    quantity_in_stock INTEGER NOT NULL DEFAULT 0,
-                    reorder_level INTEGER NOT NULL DEFAULT 0,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                );
-            """)
-            
-            # Suppliers table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS suppliers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    contact_name TEXT,
-                    phone TEXT,
-                    email TEXT,
-                    address TEXT,
-                    created_at TEXT NOT NULL
-                );
-            """)
-            
-            # Purchases table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS purchases (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    product_id INTEGER NOT NULL,
-                    supplier_id INTEGER,
-                    quantity INTEGER NOT NULL,
-                    unit_cost REAL NOT NULL,
-                    purchased_at TEXT NOT NULL,
-                    FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE RESTRICT,
-                    FOREIGN KEY (supplier_id) REFERENCES suppliers(id) ON DELETE SET NULL
-                );
-            """)
-            
-            # Sales table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS sales (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    product_id INTEGER NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    unit_price REAL NOT NULL,
-                    sold_at TEXT NOT NULL,
-                    customer_name TEXT,
-                    notes TEXT,
-                    FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE RESTRICT
-                );
-            """)
-            
-            # Create indexes for better performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_purchases_product_id ON purchases(product_id);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_product_id ON sales(product_id);")
-            
-            conn.commit()
+        """Create or upgrade the schema; a no-op once PRAGMA user_version is current"""
+        with self._lock:
+            conn = self.conn
+            if conn.execute("PRAGMA user_version;").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            try:
+                conn.executescript(_SCHEMA_TABLES)
+                with self.transaction():
+                    self._migrate_name_lower(conn)
+                    self._migrate_timestamps(conn)
+                conn.executescript(_SCHEMA_OBJECTS)
+            except BaseException:
+                # A script that fails part-way leaves its BEGIN open
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def _migrate_name_lower(self, conn):
+        """Add and backfill the lowercased sort keys on databases created before the column existed"""
+        for table in ("products", "suppliers"):
+            columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table});")}
+            if "name_lower" not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN name_lower TEXT;")
+                # Python's lower() rather than SQLite's, which only folds ASCII
+                rows = conn.execute(f"SELECT id, name FROM {table};").fetchall()
+                conn.executemany(
+                    f"UPDATE {table} SET name_lower = ? WHERE id = ?;",
+                    [(row["name"].lower(), row["id"]) for row in rows],
+                )
+
+    def _migrate_timestamps(self, conn):
+        """Rewrite timestamps stored in the old isoformat() form into the ISO_UTC_FORMAT one"""
+        # Would restamp updated_at while created_at is rewritten; _SCHEMA_OBJECTS recreates it
+        conn.execute("DROP TRIGGER IF EXISTS trg_products_updated_at;")
+        for table, columns in _TIMESTAMP_COLUMNS.items():
+            # COALESCE keeps any value SQLite cannot parse as it is
+            assignments = ", ".join(f"{c} = COALESCE(strftime('{ISO_UTC_FORMAT}', {c}), {c})" for c in columns)
+            stale = " OR ".join(f"{c} NOT LIKE '%Z'" for c in columns)
+            conn.execute(f"UPDATE {table} SET {assignments} WHERE {stale};")
+
+    @contextmanager
+    def transaction(self):
+        """Run every Database call inside the block in one transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        with self._lock:
+            if self._in_transaction:
+                # Nested use joins the outer transaction
+                yield
+                return
+            self.begin()
+            try:
+                yield
+            except BaseException:
+                self.rollback()
+                raise
+            else:
+                self.commit()
+
+    def begin(self):
+        """Start an explicit write transaction.
+
+        The calling thread holds the connection until the matching commit() or
+        rollback(); prefer transaction() unless the pair cannot share one block.
+        """
+        self._lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        self._in_transaction = True
+
+    def commit(self):
+        """Commit the transaction opened by begin()"""
+        try:
+            self._conn.execute("COMMIT")
+        except BaseException:
+            # A failed COMMIT (e.g. SQLITE_BUSY) leaves the transaction open
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._in_transaction = False
+            self._lock.release()
+
+    def rollback(self):
+        """Discard the transaction opened by begin()"""
+        try:
+            self._conn.execute("ROLLBACK")
+        finally:
+            self._in_transaction = False
+            self._lock.release()
+
+    def backup(self, target_path):
+        """Write a consistent copy of the database to target_path using SQLite's backup API.
+
+        Unlike copying the file, this includes changes still in the WAL and is safe while
+        the database is in use. File databases are read through a connection of their own,
+        so the shared one (and its lock) stays free while the copy runs on another thread.
+        """
+        target = sqlite3.connect(target_path)
+        try:
+            if self.db_path == ":memory:":
+                with self._lock:
+                    self.conn.backup(target)
+            else:
+                source = sqlite3.connect(self.db_path)
+                try:
+                    # One step is one read transaction: a consistent snapshot that writers on
+                    # the shared connection can't force to restart
+                    source.backup(target)
+                finally:
+                    source.close()
+        finally:
+            target.close()
 
     def execute(self, sql, params=()):
         """Execute SQL and return last row id"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql, params)
-            conn.commit()
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
             return cursor.lastrowid
 
+    def execute_rowcount(self, sql, params=()):
+        """Execute SQL and return the number of rows affected"""
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            return cursor.rowcount
+
+    def executemany(self, sql, seq_of_params, require_all=False):
+        """Execute SQL for every parameter set in one transaction and return rows affected.
+
+        With require_all, the whole batch is rolled back unless each parameter set
+        affected a row.
+        """
+        seq_of_params = list(seq_of_params)
+        with self.transaction():
+            cursor = self.conn.executemany(sql, seq_of_params)
+            if require_all and cursor.rowcount != len(seq_of_params):
+                raise ValueError("Batch did not apply to every row")
+            return cursor.rowcount
+
+    # Rows come back as sqlite3.Row (index by position or column name, read-only) from
+    # query_all, iter_query and query_one; query_tuples is the plain-tuple fast path.
+
     def query_all(self, sql, params=()):
-        """Query and return all rows as list of dicts"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+        """Query and return all rows as sqlite3.Row"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
 
-    def query_one(self, sql, params=()):
-        """Query and return single row as dict, or None"""
-        with self._connect() as conn:
-            cursor = conn.cursor()
+    def query_tuples(self, sql, params=()):
+        """Query and return all rows as plain tuples (no per-row dict)"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
             cursor.execute(sql, params)
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            return cursor.fetchall()
+
+    def iter_query(self, sql, params=()):
+        """Query and yield rows one at a time as sqlite3.Row, fetching in batches.
 
+        Rows index by column name like a dict but are built in C, with no dict per row.
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.arraysize = FETCH_BATCH_SIZE
+            cursor.execute(sql, params)
+        try:
+            # The lock is only held while a batch is fetched, not while the caller consumes it
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # Reset the statement now, even if the caller stops early, instead of whenever
+            # the abandoned generator happens to be collected
+            with self._lock:
+                cursor.close()
 
-def utc_now_iso():
-    """Get current UTC time as ISO string"""
-    return datetime.now(timezone.utc).isoformat() 
\ No newline at end of file
+    def query_one(self, sql, params=()):
+        """Query and return a single sqlite3.Row, or None"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone() 
@@ -3,61 +3,281 @@ GUI Application for Inventory Management System (Tkinter)
 Author: Sujal (BSc.IT)
 """
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
+from tkinter import ttk, messagebox, filedialog
 from typing import Optional
+from bisect import bisect_right
+from operator import itemgetter
 import csv
+import re
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
-import json
 import tkinter.font as tkfont
 
 from db import Database
 from services import InventoryService
+from settings import load_settings, save_settings
+
+
+def currency_formatter(symbol: str):
+    """Formatter for amounts like "₹1,234.50", with the symbol bound once for formatting many values"""
+    return (symbol.replace("{", "{{").replace("}", "}}") + "{:,.2f}").format
+
+
+OPTIMIZE_INTERVAL_MS = 30 * 60 * 1000
+SEARCH_DEBOUNCE_MS = 150
+LAZY_OVERSCAN = 8  # rows kept in the tree beyond the visible page
+LAZY_WHEEL_ROWS = 3
+EXPORT_BUFFER_SIZE = 1 << 20
+EXPORT_POLL_MS = 100
+CURRENCY_REFRESH_DELAY_MS = 50
+STATUS_FLUSH_MS = 50  # status bar repaints at most this often
+WINDOW_SIZE = (900, 600)
+REPORT_INSERT_CHUNK = 200  # report rows inserted per idle callback
+
+
+# Installed font families, enumerated once per process (slow on systems with many fonts)
+_FONT_FAMILIES: Optional[frozenset] = None
+
+
+def _font_families(root: tk.Misc) -> frozenset:
+    global _FONT_FAMILIES
+    if _FONT_FAMILIES is None:
+        _FONT_FAMILIES = frozenset(tkfont.families(root))
+    return _FONT_FAMILIES
+
+
+class LazyTreeview(ttk.Treeview):
+    """Treeview that only holds the rows in view; the full row list stays in Python.
+
+    Rows are tuples of display values whose first value is the row key (used as the iid).
+    Connect a scrollbar with attach_scrollbar() rather than yscrollcommand, and read the
+    selection with selected_keys(), which also covers selected rows scrolled out of view.
+    """
+
+    def __init__(self, master, **kw) -> None:
+        super().__init__(master, **kw)
+        self._rows: list[tuple] = []
+        self._index: dict[str, int] = {}
+        self._first = 0
+        self._displayed: dict[str, tuple] = {}  # iid -> values currently in the widget, in order
+        self._page = int(kw.get("height", 10))
+        self._selected: tuple = ()
+        self._rendering = False  # set while _render() rewrites the widget, until the next idle
+        self._vsb: Optional[ttk.Scrollbar] = None
+        self._rowheight: Optional[int] = None  # style lookup, cached across resize events
+        self.bind("<Configure>", self._on_configure)
+        self.bind("<<ThemeChanged>>", self._on_theme_changed)
+        self.bind("<<TreeviewSelect>>", self._on_select)
+        self.bind("<MouseWheel>", self._on_mousewheel)
+        self.bind("<Button-4>", lambda e: self._scroll_by(-LAZY_WHEEL_ROWS))
+        self.bind("<Button-5>", lambda e: self._scroll_by(LAZY_WHEEL_ROWS))
+        self.bind("<Up>", lambda e: self._move_focus(-1))
+        self.bind("<Down>", lambda e: self._move_focus(1))
+        self.bind("<Prior>", lambda e: self._scroll_by(-self._page))
+        self.bind("<Next>", lambda e: self._scroll_by(self._page))
+
+    def attach_scrollbar(self, vsb: ttk.Scrollbar) -> None:
+        self._vsb = vsb
+        vsb.configure(command=self._on_scrollbar)
+        self._update_scrollbar()
+
+    def set_rows(self, rows, keep_position: bool = False) -> None:
+        self._rows = list(rows)
+        self._index = {str(row[0]): i for i, row in enumerate(self._rows)}
+        self._selected = tuple(k for k in self._selected if k in self._index)
+        if not keep_position:
+            self._first = 0
+        self._render()
+
+    def sort_rows(self, key, reverse: bool = False) -> None:
+        self._rows.sort(key=key, reverse=reverse)
+        self._index = {str(row[0]): i for i, row in enumerate(self._rows)}
+        self._render()
+
+    def selected_keys(self) -> tuple:
+        return self._selected
+
+    def _on_select(self, event=None) -> None:
+        # Detaching selected rows while scrolling and re-selecting the visible ones also fire
+        # this; those keep the remembered selection. Anything else is the user, including a
+        # deselect, which must clear it so Edit/Delete don't act on a row no longer shown selected.
+        if self._rendering:
+            return
+        self._selected = self.selection()
+
+    def _end_rendering(self) -> None:
+        self._rendering = False
+
+    def _on_theme_changed(self, event=None) -> None:
+        self._rowheight = None
+        self._on_configure()
+
+    def _on_configure(self, event=None) -> None:
+        if self._rowheight is None:
+            self._rowheight = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        page = max(1, self.winfo_height() // self._rowheight - 1)  # minus the heading row
+        if page != self._page:
+            self._page = page
+            self._render()
+
+    def _on_scrollbar(self, *args) -> None:
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._rows)))
+        elif args[0] == "scroll":
+            step = self._page if args[2] == "pages" else 1
+            self._scroll_by(int(args[1]) * step)
+
+    def _on_mousewheel(self, event):
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        return self._scroll_by(-notches * LAZY_WHEEL_ROWS)
+
+    def _scroll_by(self, delta: int):
+        self._scroll_to(self._first + delta)
+        return "break"
+
+    def _scroll_to(self, first: int) -> None:
+        self._first = first
+        self._render()
+
+    def _move_focus(self, step: int):
+        focus = self.focus()
+        if not focus or focus not in self._index:
+            return None
+        target = self._index[focus] + step
+        if not 0 <= target < len(self._rows):
+            return "break"
+        if target < self._first:
+            self._scroll_to(target)
+        elif target >= self._first + self._page:
+            self._scroll_to(target - self._page + 1)
+        key = str(self._rows[target][0])
+        self.selection_set(key)
+        self._selected = (key,)  # the scroll above may have muted _on_select
+        self.focus(key)
+        return "break"
+
+    def _render(self) -> None:
+        """Make the tree hold exactly the rows in the current window"""
+        if not self._rendering:
+            # <<TreeviewSelect>> is queued, not sent, so the flag stays up until the events
+            # raised below have been handled
+            self._rendering = True
+            self.after_idle(self._end_rendering)
+        n = len(self._rows)
+        first = max(0, min(self._first, n - self._page))
+        end = min(n, first + self._page + LAZY_OVERSCAN)
+        self._first = first
+        self._sync(self._rows[first:end])
+        visible = [k for k in self._selected if first <= self._index[k] < end]
+        if visible:
+            self.selection_set(visible)
+        self._update_scrollbar()
+
+    def _sync(self, window: list[tuple]) -> None:
+        """Diff the window against what's displayed; only changed rows cost a Tk call"""
+        desired = {str(row[0]): row for row in window}
+        displayed = self._displayed
+        stale = [iid for iid in displayed if iid not in desired]
+        if stale:
+            self.delete(*stale)
+            for iid in stale:
+                del displayed[iid]
+        kept = list(displayed)
+        in_order = kept == [iid for iid in desired if iid in displayed]
+        for pos, (iid, row) in enumerate(desired.items()):
+            old = displayed.get(iid)
+            if old is None:
+                self.insert("", pos, iid=iid, values=row)
+            else:
+                if old != row:
+                    self.item(iid, values=row)
+                if not in_order:
+                    self.move(iid, "", pos)
+        # Rebuild in display order so the next diff can compare orders cheaply
+        self._displayed = desired
+
+    def _update_scrollbar(self) -> None:
+        if self._vsb is None:
+            return
+        n = len(self._rows)
+        if n <= self._page:
+            self._vsb.set(0.0, 1.0)
+        else:
+            self._vsb.set(self._first / n, min(1.0, (self._first + self._page) / n))
 
 
-def format_currency(value: float, symbol: str) -> str:
-    return f"{symbol}{value:,.2f}"
-
-
-SETTINGS_FILE = Path(__file__).with_name("settings.json")
-
+# Currency symbols skipped when a cell is parsed as a number for sorting
+_CUR_SYMS = "₹$€£"
 
-def load_settings() -> dict:
-    if SETTINGS_FILE.exists():
-        try:
-            return json.loads(SETTINGS_FILE.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-    return {}
 
-
-def save_settings(settings: dict) -> None:
-    SETTINGS_FILE.write_text(json.dumps(settings, indent=2), encoding="utf-8")
+def _parse_val(v: str):
+    """Sort key for a cell: numbers (currency and thousands separators allowed) before text"""
+    try:
+        return (0, float(v.strip().lstrip(_CUR_SYMS).replace(",", "")))
+    except ValueError:
+        # Tagged so a column mixing numbers and text still compares
+        return (1, v.lower())
 
 
 def enable_treeview_sort(tree: ttk.Treeview) -> None:
-    def sortby(col_id: str, reverse: bool) -> None:
-        rows = [(tree.set(k, col_id), k) for k in tree.get_children("")]
+    columns = tuple(tree["columns"])
 
-        def parse_val(v: str):
-            try:
-                s = v.replace(",", "").strip()
-                if s and not s[0].isdigit() and s[0] in {"₹", "$", "€", "£"}:
-                    s = s[1:]
-                return float(s)
-            except Exception:
-                return v.lower()
-
-        rows.sort(key=lambda t: parse_val(t[0]), reverse=reverse)
-        for idx, (_, k) in enumerate(rows):
-            tree.move(k, "", idx)
+    def sortby(col_id: str, reverse: bool) -> None:
+        if isinstance(tree, LazyTreeview):
+            # Most rows aren't in the widget; sort the backing list instead
+            index = columns.index(col_id)
+            tree.sort_rows(key=lambda row: _parse_val(str(row[index])), reverse=reverse)
+        else:
+            # Decorate once, sort on the keys, then move every row in a single pass
+            keyed = [(_parse_val(tree.set(k, col_id)), k) for k in tree.get_children("")]
+            keyed.sort(key=itemgetter(0), reverse=reverse)
+            for idx, (_, k) in enumerate(keyed):
+                tree.move(k, "", idx)
         tree.heading(col_id, command=lambda: sortby(col_id, not reverse))
 
     for col in tree["columns"]:
         tree.heading(col, command=lambda c=col: sortby(c, False))
 
 
-class ProductsTab(ttk.Frame):
+class _DeferredRefresh:
+    """Mixin for notebook pages whose refresh() can wait until the page is shown.
+
+    Call _watch_tab_changes() once the page exists; refresh() must clear _dirty.
+    Pages whose refresh() returns early when nothing changed set _refresh_on_select, so
+    changes made elsewhere (e.g. stock moved by a sale) show up whenever they are selected.
+    Explicit refreshes (buttons, F5) go through reload(), which re-reads the database.
+    """
+
+    _dirty = False
+    _refresh_on_select = False
+
+    def _watch_tab_changes(self, notebook: ttk.Notebook) -> None:
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+
+    def _is_selected_tab(self) -> bool:
+        return self.master.select() == str(self)
+
+    def _on_tab_changed(self, event=None) -> None:
+        if (self._dirty or self._refresh_on_select) and self._is_selected_tab():
+            self.refresh()
+
+    def _refresh_when_visible(self) -> None:
+        if self._is_selected_tab():
+            self.refresh()
+        else:
+            self._dirty = True
+
+    def reload(self) -> None:
+        # The version check can't see writes from another process, so drop the service caches
+        self.service.invalidate()
+        self.refresh()
+
+
+class ProductsTab(_DeferredRefresh, ttk.Frame):
+    _refresh_on_select = True
+
     def __init__(self, parent: ttk.Notebook, service: InventoryService, currency_symbol: str) -> None:
         super().__init__(parent)
         self.service = service
@@ -66,13 +286,29 @@ class ProductsTab(ttk.Frame):
         self.columnconfigure(0, weight=1)
 
         self.search_var = tk.StringVar()
+        self._search_after: Optional[str] = None
+        self._last_search = ""
+        # Products from the last load and the service version they came from. For filtering,
+        # their lowercased "name\0sku\n" lines are joined into one string (with each line's start
+        # offset) so a search is a single C-level scan.
+        self._products_cache: Optional[list[tuple]] = None
+        self._loaded_version = -1
+        self._search_text = ""
+        self._search_offsets: list[int] = []
+        # Display rows aligned with _products_cache, formatted once per load or currency change
+        self._display_rows: list[tuple] = []
+        self._rows_symbol: Optional[str] = None
+        # (products version, currency symbol, query) of what the tree currently shows
+        self._rendered: Optional[tuple] = None
 
         search_frame = ttk.Frame(self)
         search_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 6))
         ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
-        ttk.Button(search_frame, text="Find", command=self.refresh).pack(side=tk.LEFT)
+        # Filter as the user types, but only once typing pauses
+        search_entry.bind("<KeyRelease>", self._schedule_search)
+        ttk.Button(search_frame, text="Find", command=self.search_now).pack(side=tk.LEFT)
         ttk.Button(search_frame, text="Clear", command=self.clear_search).pack(side=tk.LEFT, padx=(6, 0))
 
         buttons = ttk.Frame(self)
@@ -81,10 +317,10 @@ class ProductsTab(ttk.Frame):
         ttk.Button(buttons, text="Edit", command=self.edit_selected).pack(side=tk.LEFT, padx=6)
         ttk.Button(buttons, text="Delete", command=self.delete_selected).pack(side=tk.LEFT)
         ttk.Button(buttons, text="Export CSV", command=self.export_csv).pack(side=tk.LEFT, padx=6)
-        ttk.Button(buttons, text="Refresh", command=self.refresh).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Refresh", command=self.reload).pack(side=tk.LEFT)
 
         columns = ("id", "name", "sku", "unit_price", "quantity_in_stock", "reorder_level")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=16)
+        self.tree = LazyTreeview(self, columns=columns, show="headings", height=16)
         self.tree.heading("id", text="ID")
         self.tree.heading("name", text="Name")
         self.tree.heading("sku", text="SKU")
@@ -99,8 +335,8 @@ class ProductsTab(ttk.Frame):
         self.tree.column("reorder_level", width=100, anchor=tk.E)
 
         # Add vertical scrollbar
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
+        vsb = ttk.Scrollbar(self, orient="vertical")
+        self.tree.attach_scrollbar(vsb)
         self.tree.grid(row=2, column=0, sticky="nsew", padx=(10, 0), pady=(6, 10))
         vsb.grid(row=2, column=1, sticky="ns", pady=(6, 10))
 
@@ -112,29 +348,92 @@ class ProductsTab(ttk.Frame):
         style.configure("Treeview", rowheight=24)
         self.tree.tag_configure("odd", background="#fbfbfb")
 
+        # Changes made while another tab is showing are redrawn when this tab is selected
+        self._watch_tab_changes(parent)
+
         self.refresh()
 
+    def _cancel_pending_search(self) -> None:
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+
+    def _schedule_search(self, event=None) -> None:
+        if self.search_var.get() == self._last_search:
+            return  # cursor movement, modifiers, etc.
+        self._cancel_pending_search()
+        self._search_after = self.after(SEARCH_DEBOUNCE_MS, self.search_now)
+
+    def search_now(self) -> None:
+        self._cancel_pending_search()
+        self._last_search = self.search_var.get()
+        self._render(keep_position=False)
+
     def clear_search(self) -> None:
         self.search_var.set("")
-        self.refresh()
+        self.search_now()
 
     def refresh(self) -> None:
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        q = (self.search_var.get() or "").lower()
+        """Redraw, reloading products if the service reports changes since the last load"""
+        self._dirty = False
+        state = (self.service.products_version, self.currency_symbol, (self.search_var.get() or "").lower())
+        if state == self._rendered:
+            return  # nothing the table shows has changed
+        self._render(keep_position=True)
+
+    def _load_products(self, version: int) -> None:
         products = self.service.list_products()
-        if q:
-            products = [p for p in products if q in (p['name'] or '').lower() or q in (p.get('sku') or '').lower()]
-        for p in products:
-            price_str = format_currency(float(p['unit_price']), self.currency_symbol)
-            self.tree.insert("", tk.END, values=(p['id'], p['name'], p.get('sku') or '', price_str, p['quantity_in_stock'], p['reorder_level']))
+        lines = [f"{(p.name or '').lower()}\0{(p.sku or '').lower()}\n" for p in products]
+        offsets = []
+        pos = 0
+        for line in lines:
+            offsets.append(pos)
+            pos += len(line)
+        self._products_cache = products
+        self._loaded_version = version
+        self._search_text = "".join(lines)
+        self._search_offsets = offsets
+        self._rows_symbol = None
+
+    def _matching_rows(self, q: str) -> list[tuple]:
+        """Display rows of the products whose lowercased name or SKU contains q"""
+        if "\0" in q or "\n" in q:
+            return []  # would match across the separators, never inside a field
+        pattern = re.compile(re.escape(q))
+        text, offsets, rows = self._search_text, self._search_offsets, self._display_rows
+        matches = []
+        m = pattern.search(text)
+        while m:
+            i = bisect_right(offsets, m.start()) - 1
+            matches.append(rows[i])
+            if i + 1 >= len(offsets):
+                break
+            # One hit per product is enough; resume at the next line
+            m = pattern.search(text, offsets[i + 1])
+        return matches
+
+    def _render(self, keep_position: bool) -> None:
+        """Redraw from the cached products, applying the search filter"""
+        version = self.service.products_version
+        if self._products_cache is None or version != self._loaded_version:
+            self._load_products(version)
+        if self._rows_symbol != self.currency_symbol:
+            fmt = currency_formatter(self.currency_symbol)
+            self._display_rows = [
+                (pid, name, sku or '', fmt(float(price)), qty, reorder)
+                for pid, name, sku, price, qty, reorder in self._products_cache
+            ]
+            self._rows_symbol = self.currency_symbol
+        q = (self.search_var.get() or "").lower()
+        rows = self._matching_rows(q) if q else self._display_rows
+        self.tree.set_rows(rows, keep_position=keep_position)
+        self._rendered = (version, self.currency_symbol, q)
 
     def _get_selected_id(self) -> Optional[int]:
-        selected = self.tree.selection()
+        selected = self.tree.selected_keys()
         if not selected:
             return None
-        values = self.tree.item(selected[0], 'values')
-        return int(values[0])
+        return int(selected[0])
 
     def add_product(self) -> None:
         ProductDialog(self, title="Add Product", on_submit=self._create_product)
@@ -142,7 +441,7 @@ class ProductsTab(ttk.Frame):
     def _create_product(self, data: dict) -> None:
         try:
             self.service.add_product(data['name'], data.get('sku'), data.get('description'), float(data['unit_price']), int(data['reorder_level']))
-            self.refresh()
+            self._refresh_when_visible()
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
 
@@ -167,7 +466,7 @@ class ProductsTab(ttk.Frame):
                 'reorder_level': int(data['reorder_level']),
             }
             self.service.update_product(product_id, **fields)
-            self.refresh()
+            self._refresh_when_visible()
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
 
@@ -180,27 +479,29 @@ class ProductsTab(ttk.Frame):
             return
         try:
             self.service.delete_product(product_id)
-            self.refresh()
+            self._refresh_when_visible()
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
 
     def export_csv(self) -> None:
-        products = self.service.list_products()
         filepath = filedialog.asksaveasfilename(parent=self, title="Export Products CSV", defaultextension=".csv", filetypes=[("CSV Files", "*.csv")], initialfile=f"products_{datetime.now(timezone.utc).strftime('%Y%m%d')}.csv")
         if not filepath:
             return
-        try:
-            with open(filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["id", "name", "sku", "description", "unit_price", "quantity_in_stock", "reorder_level"])
-                for p in products:
-                    writer.writerow([p['id'], p['name'], p.get('sku') or '', p.get('description') or '', p['unit_price'], p['quantity_in_stock'], p['reorder_level']])
-            messagebox.showinfo("Export", f"Exported to {filepath}", parent=self)
-        except Exception as e:
-            messagebox.showerror("Error", str(e), parent=self)
+        # Streamed straight from the cursor; the product list is never held in memory
+        ExportDialog(
+            self,
+            filepath,
+            ["id", "name", "sku", "description", "unit_price", "quantity_in_stock", "reorder_level"],
+            lambda: (
+                (p['id'], p['name'], p['sku'] or '', p['description'] or '', p['unit_price'], p['quantity_in_stock'], p['reorder_level'])
+                for p in self.service.iter_products()
+            ),
+        )
 
 
-class SuppliersTab(ttk.Frame):
+class SuppliersTab(_DeferredRefresh, ttk.Frame):
+    _refresh_on_select = True
+
     def __init__(self, parent: ttk.Notebook, service: InventoryService) -> None:
         super().__init__(parent)
         self.service = service
@@ -212,10 +513,10 @@ class SuppliersTab(ttk.Frame):
         ttk.Button(buttons, text="Add", command=self.add_supplier).pack(side=tk.LEFT)
         ttk.Button(buttons, text="Edit", command=self.edit_selected).pack(side=tk.LEFT, padx=6)
         ttk.Button(buttons, text="Delete", command=self.delete_selected).pack(side=tk.LEFT)
-        ttk.Button(buttons, text="Refresh", command=self.refresh).pack(side=tk.LEFT, padx=6)
+        ttk.Button(buttons, text="Refresh", command=self.reload).pack(side=tk.LEFT, padx=6)
 
         columns = ("id", "name", "contact_name", "phone", "email", "address")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=16)
+        self.tree = LazyTreeview(self, columns=columns, show="headings", height=16)
         for c, label, width, anchor in (
             ("id", "ID", 50, tk.E),
             ("name", "Name", 220, tk.W),
@@ -226,8 +527,8 @@ class SuppliersTab(ttk.Frame):
         ):
             self.tree.heading(c, text=label)
             self.tree.column(c, width=width, anchor=anchor)
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
+        vsb = ttk.Scrollbar(self, orient="vertical")
+        self.tree.attach_scrollbar(vsb)
         self.tree.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=(6, 10))
         vsb.grid(row=1, column=1, sticky="ns", pady=(6, 10))
 
@@ -236,20 +537,29 @@ class SuppliersTab(ttk.Frame):
         style.configure("Treeview", rowheight=24)
         self.tree.tag_configure("odd", background="#fbfbfb")
 
+        self._watch_tab_changes(parent)
+
+        # Suppliers version the table was last filled from
+        self._last_seen_version = -1
         self.refresh()
 
     def refresh(self) -> None:
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for s in self.service.list_suppliers():
-            self.tree.insert("", tk.END, values=(s['id'], s['name'], s.get('contact_name') or '', s.get('phone') or '', s.get('email') or '', s.get('address') or ''))
+        self._dirty = False
+        version = self.service.suppliers_version
+        if version == self._last_seen_version:
+            return
+        self._last_seen_version = version
+        self.tree.set_rows(
+            ((sid, name, contact or '', phone or '', email or '', address or '')
+             for sid, name, contact, phone, email, address in self.service.list_suppliers()),
+            keep_position=True,
+        )
 
     def _get_selected_id(self) -> Optional[int]:
-        selected = self.tree.selection()
+        selected = self.tree.selected_keys()
         if not selected:
             return None
-        values = self.tree.item(selected[0], 'values')
-        return int(values[0])
+        return int(selected[0])
 
     def add_supplier(self) -> None:
         SupplierDialog(self, title="Add Supplier", on_submit=self._create_supplier)
@@ -257,7 +567,7 @@ class SuppliersTab(ttk.Frame):
     def _create_supplier(self, data: dict) -> None:
         try:
             self.service.add_supplier(data['name'], data.get('contact_name'), data.get('phone'), data.get('email'), data.get('address'))
-            self.refresh()
+            self._refresh_when_visible()
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
 
@@ -282,7 +592,7 @@ class SuppliersTab(ttk.Frame):
                 email=data.get('email'),
                 address=data.get('address'),
             )
-            self.refresh()
+            self._refresh_when_visible()
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
 
@@ -295,12 +605,14 @@ class SuppliersTab(ttk.Frame):
             return
         try:
             self.service.delete_supplier(sid)
-            self.refresh()
+            self._refresh_when_visible()
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
 
 
-class TransactionsTab(ttk.Frame):
+class TransactionsTab(_DeferredRefresh, ttk.Frame):
+    _refresh_on_select = True
+
     def __init__(self, parent: ttk.Notebook, service: InventoryService, currency_symbol: str) -> None:
         super().__init__(parent)
         self.service = service
@@ -330,12 +642,28 @@ class TransactionsTab(ttk.Frame):
         self.notes_var = tk.StringVar()
 
         self._build_sale_ui()
+        # The builders above filled the comboboxes from these versions
+        self._last_seen_versions = (self.service.products_version, self.service.suppliers_version)
+        self._watch_tab_changes(parent)
 
-    def _get_products_list(self) -> list[tuple[int, str]]:
-        return [(p['id'], f"{p['name']} (SKU: {p.get('sku') or '-'})") for p in self.service.list_products()]
+    def refresh(self) -> None:
+        self._dirty = False
+        versions = (self.service.products_version, self.service.suppliers_version)
+        if versions == self._last_seen_versions:
+            return  # the comboboxes already offer the current lists
+        self._last_seen_versions = versions
+        self._refresh_purchase_choices()
+        self._refresh_sale_choices()
 
-    def _get_suppliers_list(self) -> list[tuple[int, str]]:
-        return [(s['id'], s['name']) for s in self.service.list_suppliers()]
+    @staticmethod
+    def _set_choices(cb: ttk.Combobox, values: tuple[str, ...]) -> None:
+        cb['values'] = values
+        # Keep the user's pick if it is still offered
+        if cb.get() not in values:
+            if values:
+                cb.current(0)
+            else:
+                cb.set("")
 
     def _build_purchase_ui(self) -> None:
         frm = self.purchase_frame
@@ -355,14 +683,8 @@ class TransactionsTab(ttk.Frame):
         self._refresh_purchase_choices()
 
     def _refresh_purchase_choices(self) -> None:
-        prods = self._get_products_list()
-        sups = self._get_suppliers_list()
-        self.products_cb_p['values'] = [f"{pid}: {label}" for pid, label in prods]
-        self.suppliers_cb['values'] = [f"{sid}: {label}" for sid, label in sups]
-        if prods:
-            self.products_cb_p.current(0)
-        if sups:
-            self.suppliers_cb.current(0)
+        self._set_choices(self.products_cb_p, self.service.products_combobox_values())
+        self._set_choices(self.suppliers_cb, self.service.suppliers_combobox_values())
 
     def record_purchase(self) -> None:
         try:
@@ -395,10 +717,7 @@ class TransactionsTab(ttk.Frame):
         self._refresh_sale_choices()
 
     def _refresh_sale_choices(self) -> None:
-        prods = self._get_products_list()
-        self.products_cb_s['values'] = [f"{pid}: {label}" for pid, label in prods]
-        if prods:
-            self.products_cb_s.current(0)
+        self._set_choices(self.products_cb_s, self.service.products_combobox_values())
 
     def record_sale(self) -> None:
         try:
@@ -413,7 +732,14 @@ class TransactionsTab(ttk.Frame):
             messagebox.showerror("Error", str(e), parent=self)
 
 
-class ReportsTab(ttk.Frame):
+class ReportsTab(_DeferredRefresh, ttk.Frame):
+    # View -> (column labels, width of the numeric columns)
+    VIEW_COLUMNS: dict[str, tuple[tuple[str, str, str], int]] = {
+        "Stock Levels": (("Product", "Stock", "Reorder"), 100),
+        "Low Stock": (("Product", "Stock", "Reorder"), 100),
+        "Sales Summary": (("Product", "Qty Sold", "Revenue"), 120),
+    }
+
     def __init__(self, parent: ttk.Notebook, service: InventoryService, currency_symbol: str) -> None:
         super().__init__(parent)
         self.service = service
@@ -425,40 +751,56 @@ class ReportsTab(ttk.Frame):
         ttk.Label(top, text="Report:").pack(side=tk.LEFT)
         self.view_cb = ttk.Combobox(top, textvariable=self.view_var, state="readonly", values=["Stock Levels", "Low Stock", "Sales Summary"], width=20)
         self.view_cb.pack(side=tk.LEFT, padx=6)
-        ttk.Button(top, text="Run", command=self.refresh).pack(side=tk.LEFT)
+        ttk.Button(top, text="Run", command=self.reload).pack(side=tk.LEFT)
         ttk.Button(top, text="Export CSV", command=self.export_csv).pack(side=tk.LEFT, padx=6)
 
         # Keep stable column identifiers and just change headings/widths
         self.tree = ttk.Treeview(self, columns=("col1", "col2", "col3"), show="headings", height=16)
         self.tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        self._current_view: Optional[str] = None
+        # Rows still to be inserted, and a counter that retires the chunks of a superseded run
+        self._pending_rows: list[tuple] = []
+        self._refresh_epoch = 0
+        self._watch_tab_changes(parent)
         self.refresh()
 
     def refresh(self) -> None:
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._dirty = False
+        self._refresh_epoch += 1
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         view = self.view_var.get()
-        if view == "Stock Levels":
-            labels = ("Product", "Stock", "Reorder")
+        if view != self._current_view:
+            labels, width = self.VIEW_COLUMNS[view]
             for i, h in enumerate(labels):
                 self.tree.heading(f"col{i+1}", text=h)
-                self.tree.column(f"col{i+1}", width=(250 if i == 0 else 100), anchor=(tk.W if i == 0 else tk.E))
-            for p in self.service.report_stock_levels():
-                self.tree.insert("", tk.END, values=(p['name'], p['quantity_in_stock'], p['reorder_level']))
+                self.tree.column(f"col{i+1}", width=(250 if i == 0 else width), anchor=(tk.W if i == 0 else tk.E))
+            self._current_view = view
+        if view == "Stock Levels":
+            rows = [(name, qty, reorder) for _, name, _, _, qty, reorder in self.service.report_stock_levels()]
         elif view == "Low Stock":
-            labels = ("Product", "Stock", "Reorder")
-            for i, h in enumerate(labels):
-                self.tree.heading(f"col{i+1}", text=h)
-                self.tree.column(f"col{i+1}", width=(250 if i == 0 else 100), anchor=(tk.W if i == 0 else tk.E))
-            for p in self.service.report_low_stock():
-                self.tree.insert("", tk.END, values=(p['name'], p['quantity_in_stock'], p['reorder_level']))
+            rows = [(name, qty, reorder) for _, name, _, _, qty, reorder in self.service.report_low_stock()]
         else:
-            labels = ("Product", "Qty Sold", "Revenue")
-            for i, h in enumerate(labels):
-                self.tree.heading(f"col{i+1}", text=h)
-                self.tree.column(f"col{i+1}", width=(250 if i == 0 else 120), anchor=(tk.W if i == 0 else tk.E))
-            for r in self.service.report_sales_summary():
-                revenue = format_currency(float(r['total_revenue'] or 0), self.currency_symbol)
-                self.tree.insert("", tk.END, values=(r['product_name'], int(r['total_quantity_sold'] or 0), revenue))
+            fmt = currency_formatter(self.currency_symbol)
+            rows = [
+                (r['product_name'], r['total_quantity_sold'], fmt(r['total_revenue']))
+                for r in self.service.report_sales_summary()
+            ]
+        # Reversed so each chunk pops off the end instead of slicing from the front
+        rows.reverse()
+        self._pending_rows = rows
+        self._insert_chunk(self._refresh_epoch)
+
+    def _insert_chunk(self, epoch: int) -> None:
+        """Insert the next chunk of pending rows, yielding to the event loop in between"""
+        if epoch != self._refresh_epoch:
+            return  # a newer refresh has replaced these rows
+        pending, insert = self._pending_rows, self.tree.insert
+        for _ in range(min(REPORT_INSERT_CHUNK, len(pending))):
+            insert("", tk.END, values=pending.pop())
+        if pending:
+            self.after_idle(self._insert_chunk, epoch)
 
     def export_csv(self) -> None:
         view = self.view_var.get()
@@ -470,29 +812,26 @@ class ReportsTab(ttk.Frame):
         filepath = filedialog.asksaveasfilename(parent=self, title="Export CSV", defaultextension=".csv", filetypes=[("CSV Files", "*.csv")], initialfile=default_name)
         if not filepath:
             return
-        try:
-            with open(filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                if view == "Stock Levels":
-                    writer.writerow(["product", "stock", "reorder"])
-                    for p in self.service.report_stock_levels():
-                        writer.writerow([p['name'], p['quantity_in_stock'], p['reorder_level']])
-                elif view == "Low Stock":
-                    writer.writerow(["product", "stock", "reorder"])
-                    for p in self.service.report_low_stock():
-                        writer.writerow([p['name'], p['quantity_in_stock'], p['reorder_level']])
-                else:
-                    writer.writerow(["product", "qty_sold", "revenue"])
-                    for r in self.service.report_sales_summary():
-                        writer.writerow([r['product_name'], int(r['total_quantity_sold'] or 0), float(r['total_revenue'] or 0)])
-            messagebox.showinfo("Export", f"Exported to {filepath}", parent=self)
-        except Exception as e:
-            messagebox.showerror("Error", str(e), parent=self)
+        service = self.service
+        if view == "Stock Levels":
+            header = ["product", "stock", "reorder"]
+            make_rows = lambda: ((p['name'], p['quantity_in_stock'], p['reorder_level']) for p in service.iter_products())
+        elif view == "Low Stock":
+            header = ["product", "stock", "reorder"]
+            make_rows = lambda: ((p.name, p.quantity_in_stock, p.reorder_level) for p in service.report_low_stock())
+        else:
+            header = ["product", "qty_sold", "revenue"]
+            make_rows = lambda: (
+                (r['product_name'], r['total_quantity_sold'], r['total_revenue'])
+                for r in service.report_sales_summary()
+            )
+        ExportDialog(self, filepath, header, make_rows)
 
 
 class SettingsTab(ttk.Frame):
-    def __init__(self, parent: ttk.Notebook, on_currency_change) -> None:
+    def __init__(self, parent: ttk.Notebook, service: InventoryService, on_currency_change) -> None:
         super().__init__(parent)
+        self.service = service
         self.on_currency_change = on_currency_change
         settings = load_settings()
         self.currency_var = tk.StringVar(value=settings.get("currency", "₹"))
@@ -514,26 +853,17 @@ class SettingsTab(ttk.Frame):
         self.on_currency_change(symbol)
         messagebox.showinfo("Saved", "Settings updated.", parent=self)
 
-    def backup_db(self) -> None:
-        db_file = Path(__file__).with_name("inventory.db")
-        if not db_file.exists():
-            messagebox.showerror("Error", "Database not found.", parent=self)
-            return
+    def backup_db(self, on_done=None) -> None:
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         default_name = f"inventory_{timestamp}.db"
         filepath = filedialog.asksaveasfilename(parent=self, title="Save backup", defaultextension=".db", filetypes=[("SQLite DB", "*.db")], initialfile=default_name)
         if not filepath:
             return
-        try:
-            data = db_file.read_bytes()
-            Path(filepath).write_bytes(data)
-            messagebox.showinfo("Backup", f"Backup saved: {filepath}", parent=self)
-        except Exception as e:
-            messagebox.showerror("Error", str(e), parent=self)
+        BackupDialog(self, filepath, self.service.backup_database, on_done)
 
 
 class ProductDialog(tk.Toplevel):
-    def __init__(self, parent: ProductsTab, title: str, on_submit, initial: Optional[dict] = None) -> None:
+    def __init__(self, parent: ProductsTab, title: str, on_submit, initial: Optional[sqlite3.Row] = None) -> None:
         super().__init__(parent)
         self.title(title)
         self.transient(parent)
@@ -541,11 +871,12 @@ class ProductDialog(tk.Toplevel):
         self.resizable(False, False)
         self.on_submit = on_submit
 
-        self.name_var = tk.StringVar(value=(initial or {}).get('name') or '')
-        self.sku_var = tk.StringVar(value=(initial or {}).get('sku') or '')
-        self.desc_var = tk.StringVar(value=(initial or {}).get('description') or '')
-        self.price_var = tk.StringVar(value=str((initial or {}).get('unit_price') or ''))
-        self.reorder_var = tk.StringVar(value=str((initial or {}).get('reorder_level') or '0'))
+        values = dict(initial) if initial is not None else {}
+        self.name_var = tk.StringVar(value=values.get('name') or '')
+        self.sku_var = tk.StringVar(value=values.get('sku') or '')
+        self.desc_var = tk.StringVar(value=values.get('description') or '')
+        self.price_var = tk.StringVar(value=str(values.get('unit_price') or ''))
+        self.reorder_var = tk.StringVar(value=str(values.get('reorder_level') or '0'))
 
         body = ttk.Frame(self)
         body.pack(fill=tk.BOTH, expand=True, padx=12, pady=12)
@@ -584,7 +915,7 @@ class ProductDialog(tk.Toplevel):
 
 
 class SupplierDialog(tk.Toplevel):
-    def __init__(self, parent: SuppliersTab, title: str, on_submit, initial: Optional[dict] = None) -> None:
+    def __init__(self, parent: SuppliersTab, title: str, on_submit, initial: Optional[sqlite3.Row] = None) -> None:
         super().__init__(parent)
         self.title(title)
         self.transient(parent)
@@ -592,11 +923,12 @@ class SupplierDialog(tk.Toplevel):
         self.resizable(False, False)
         self.on_submit = on_submit
 
-        self.name_var = tk.StringVar(value=(initial or {}).get('name') or '')
-        self.contact_var = tk.StringVar(value=(initial or {}).get('contact_name') or '')
-        self.phone_var = tk.StringVar(value=(initial or {}).get('phone') or '')
-        self.email_var = tk.StringVar(value=(initial or {}).get('email') or '')
-        self.address_var = tk.StringVar(value=(initial or {}).get('address') or '')
+        values = dict(initial) if initial is not None else {}
+        self.name_var = tk.StringVar(value=values.get('name') or '')
+        self.contact_var = tk.StringVar(value=values.get('contact_name') or '')
+        self.phone_var = tk.StringVar(value=values.get('phone') or '')
+        self.email_var = tk.StringVar(value=values.get('email') or '')
+        self.address_var = tk.StringVar(value=values.get('address') or '')
 
         body = ttk.Frame(self)
         body.pack(fill=tk.BOTH, expand=True, padx=12, pady=12)
@@ -634,11 +966,133 @@ class SupplierDialog(tk.Toplevel):
         self.destroy()
 
 
+class _ExportCancelled(Exception):
+    pass
+
+
+class ExportDialog(tk.Toplevel):
+    """Modal progress window for a CSV export written on a worker thread.
+
+    make_rows is called on the worker, so the database fetch overlaps the file writes
+    while the Tk loop keeps running. The worker never touches Tk; this window polls it.
+    """
+
+    def __init__(self, parent: tk.Misc, filepath: str, header: list[str], make_rows) -> None:
+        super().__init__(parent)
+        self.title("Exporting")
+        self.transient(parent)
+        self.resizable(False, False)
+        self._filepath = filepath
+        self._cancel = threading.Event()
+        self._written = 0
+        self._outcome: Optional[tuple[str, Optional[Exception]]] = None
+
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True, padx=12, pady=12)
+        ttk.Label(body, text=f"Writing {Path(filepath).name}").pack(anchor=tk.W)
+        self.progress_var = tk.StringVar(value="Starting...")
+        ttk.Label(body, textvariable=self.progress_var).pack(anchor=tk.W, pady=(4, 8))
+        bar = ttk.Progressbar(body, mode="indeterminate", length=260)
+        bar.pack(fill=tk.X)
+        bar.start(15)
+        ttk.Button(body, text="Cancel", command=self._cancel.set).pack(anchor=tk.E, pady=(10, 0))
+        self.protocol("WM_DELETE_WINDOW", self._cancel.set)
+        self.grab_set()
+
+        threading.Thread(target=self._work, args=(header, make_rows), daemon=True).start()
+        self.after(EXPORT_POLL_MS, self._poll)
+
+    def _counted(self, rows):
+        for row in rows:
+            if self._cancel.is_set():
+                raise _ExportCancelled
+            self._written += 1
+            yield row
+
+    def _work(self, header: list[str], make_rows) -> None:
+        try:
+            with open(self._filepath, "w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(self._counted(make_rows()))
+        except _ExportCancelled:
+            Path(self._filepath).unlink(missing_ok=True)
+            self._outcome = ("cancelled", None)
+        except Exception as e:
+            self._outcome = ("error", e)
+        else:
+            self._outcome = ("done", None)
+
+    def _poll(self) -> None:
+        self.progress_var.set(f"{self._written:,} rows written")
+        if self._outcome is None:
+            self.after(EXPORT_POLL_MS, self._poll)
+            return
+        parent = self.master
+        kind, error = self._outcome
+        self.grab_release()
+        self.destroy()
+        if kind == "done":
+            messagebox.showinfo("Export", f"Exported to {self._filepath}", parent=parent)
+        elif kind == "error":
+            messagebox.showerror("Error", str(error), parent=parent)
+
+
+class BackupDialog(tk.Toplevel):
+    """Modal progress window for a database backup running on a worker thread"""
+
+    def __init__(self, parent: tk.Misc, filepath: str, backup, on_done=None) -> None:
+        super().__init__(parent)
+        self.title("Backing up")
+        self.transient(parent)
+        self.resizable(False, False)
+        self._filepath = filepath
+        self._on_done = on_done
+        self._outcome: Optional[tuple[str, Optional[Exception]]] = None
+
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True, padx=12, pady=12)
+        ttk.Label(body, text=f"Writing {Path(filepath).name}").pack(anchor=tk.W, pady=(0, 8))
+        bar = ttk.Progressbar(body, mode="indeterminate", length=260)
+        bar.pack(fill=tk.X)
+        bar.start(10)
+        # The copy can't be interrupted part-way, so closing the window just waits for it
+        self.protocol("WM_DELETE_WINDOW", lambda: None)
+        self.grab_set()
+
+        threading.Thread(target=self._work, args=(backup,), daemon=True).start()
+        self.after(EXPORT_POLL_MS, self._poll)
+
+    def _work(self, backup) -> None:
+        try:
+            backup(self._filepath)
+        except Exception as e:
+            self._outcome = ("error", e)
+        else:
+            self._outcome = ("done", None)
+
+    def _poll(self) -> None:
+        if self._outcome is None:
+            self.after(EXPORT_POLL_MS, self._poll)
+            return
+        parent = self.master
+        kind, error = self._outcome
+        self.grab_release()
+        self.destroy()
+        if kind == "done":
+            if self._on_done is not None:
+                self._on_done()
+            messagebox.showinfo("Backup", f"Backup saved: {self._filepath}", parent=parent)
+        else:
+            messagebox.showerror("Error", str(error), parent=parent)
+
+
 class MainWindow(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
         self.title("Inventory Management System")
-        self.geometry("900x600")
+        # Size and position are known up front, so the window is placed before it is first mapped
+        self._center_on_screen()
 
         # Init core services
         self.database = Database()
@@ -660,29 +1114,44 @@ class MainWindow(tk.Tk):
         self.notebook = notebook
 
         self.products_tab = ProductsTab(notebook, self.service, self.currency_symbol)
-        self.suppliers_tab = SuppliersTab(notebook, self.service)
-        self.transactions_tab = TransactionsTab(notebook, self.service, self.currency_symbol)
-        self.reports_tab = ReportsTab(notebook, self.service, self.currency_symbol)
-        self.settings_tab = SettingsTab(notebook, self._on_currency_change)
-
         notebook.add(self.products_tab, text="Products")
-        notebook.add(self.suppliers_tab, text="Suppliers")
-        notebook.add(self.transactions_tab, text="Transactions")
-        notebook.add(self.reports_tab, text="Reports")
-        notebook.add(self.settings_tab, text="Settings")
+
+        # The other tabs start as empty placeholders and are built (and run their first
+        # query) when first selected, or when something needs them
+        self.suppliers_tab: Optional[SuppliersTab] = None
+        self.transactions_tab: Optional[TransactionsTab] = None
+        self.reports_tab: Optional[ReportsTab] = None
+        self.settings_tab: Optional[SettingsTab] = None
+        self._tab_factories = {
+            "suppliers": lambda: SuppliersTab(notebook, self.service),
+            "transactions": lambda: TransactionsTab(notebook, self.service, self.currency_symbol),
+            "reports": lambda: ReportsTab(notebook, self.service, self.currency_symbol),
+            "settings": lambda: SettingsTab(notebook, self.service, self._on_currency_change),
+        }
+        self._placeholders: dict[str, ttk.Frame] = {}
+        for key, label in (("suppliers", "Suppliers"), ("transactions", "Transactions"), ("reports", "Reports"), ("settings", "Settings")):
+            placeholder = ttk.Frame(notebook)
+            notebook.add(placeholder, text=label)
+            self._placeholders[key] = placeholder
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
 
         # Status bar
         self.status_var = tk.StringVar(value="Ready")
         status = ttk.Label(self, textvariable=self.status_var, anchor="w", relief="sunken")
         status.pack(side=tk.BOTTOM, fill=tk.X)
-
-        # Center window
-        self.after(50, self._center_on_screen)
+        # Bursts of set_status() calls collapse into one label update per STATUS_FLUSH_MS
+        self._status_pending = "Ready"
+        self._status_scheduled = False
 
         # Global shortcuts
         self.bind_all("<F5>", lambda e: self.refresh_current_tab())
         self.protocol("WM_DELETE_WINDOW", self._on_exit)
 
+        # Keep query plans current during long sessions, not only at exit
+        self.after(OPTIMIZE_INTERVAL_MS, self._periodic_optimize)
+
+        self._pending_refresh: Optional[str] = None
+
     def _apply_style(self) -> None:
         style = ttk.Style(self)
         try:
@@ -691,10 +1160,11 @@ class MainWindow(tk.Tk):
             pass
         # Fonts
         default_font = tkfont.nametofont("TkDefaultFont")
-        family = "Segoe UI" if "Segoe UI" in tkfont.families() else default_font.cget("family")
+        family = "Segoe UI" if "Segoe UI" in _font_families(self) else default_font.cget("family")
         size = max(10, default_font.cget("size"))
         default_font.configure(family=family, size=size)
-        heading_font = tkfont.Font(family=family, size=size, weight="bold")
+        # Kept on the window so the named font lives as long as the styles that use it
+        heading_font = self._heading_font = tkfont.Font(self, family=family, size=size, weight="bold")
         style.configure("TButton", padding=6)
         style.configure("Treeview", rowheight=26, font=default_font)
         style.configure("Treeview.Heading", font=heading_font)
@@ -719,12 +1189,8 @@ class MainWindow(tk.Tk):
         self.config(menu=menubar)
 
     def _menu_backup(self) -> None:
-        # Delegate to settings tab backup
-        try:
-            self.settings_tab.backup_db()
-            self.set_status("Backup created")
-        except Exception:
-            pass
+        # Delegate to settings tab backup; it finishes in the background
+        self._ensure_tab("settings").backup_db(on_done=lambda: self.set_status("Backup created"))
 
     def _show_about(self) -> None:
         messagebox.showinfo(
@@ -734,39 +1200,90 @@ class MainWindow(tk.Tk):
         )
 
     def set_status(self, text: str) -> None:
-        self.status_var.set(text)
+        self._status_pending = text
+        if not self._status_scheduled:
+            self._status_scheduled = True
+            self.after(STATUS_FLUSH_MS, self._flush_status)
+
+    def _flush_status(self) -> None:
+        self._status_scheduled = False
+        self.status_var.set(self._status_pending)
 
     def refresh_current_tab(self) -> None:
         tab = self.notebook.nametowidget(self.notebook.select())
-        if hasattr(tab, "refresh"):
+        # reload() rather than refresh(), so rows written by another process show up too
+        reload = getattr(tab, "reload", None)
+        if reload is not None:
             try:
-                tab.refresh()
+                reload()
                 self.set_status("Refreshed")
             except Exception as e:
                 messagebox.showerror("Error", str(e), parent=self)
 
     def _center_on_screen(self) -> None:
-        self.update_idletasks()
-        w = self.winfo_width()
-        h = self.winfo_height()
+        w, h = WINDOW_SIZE
         sw = self.winfo_screenwidth()
         sh = self.winfo_screenheight()
         x = max(0, (sw - w) // 2)
         y = max(0, (sh - h) // 3)
         self.geometry(f"{w}x{h}+{x}+{y}")
 
+    def _periodic_optimize(self) -> None:
+        try:
+            self.database.optimize()
+        except Exception:
+            pass
+        self.after(OPTIMIZE_INTERVAL_MS, self._periodic_optimize)
+
+    def _on_tab_changed(self, event=None) -> None:
+        selected = self.notebook.select()
+        for key, placeholder in self._placeholders.items():
+            if str(placeholder) == selected:
+                self._ensure_tab(key)
+                break
+
+    def _ensure_tab(self, key: str):
+        """Return the tab for key, swapping it in for its placeholder on first use"""
+        tab = getattr(self, f"{key}_tab")
+        if tab is not None:
+            return tab
+        placeholder = self._placeholders.pop(key)
+        notebook = self.notebook
+        was_selected = notebook.select() == str(placeholder)
+        label = notebook.tab(placeholder, "text")
+        tab = self._tab_factories.pop(key)()
+        notebook.insert(notebook.index(placeholder), tab, text=label)
+        setattr(self, f"{key}_tab", tab)
+        if was_selected:
+            notebook.select(tab)
+        notebook.forget(placeholder)
+        placeholder.destroy()
+        return tab
+
     def _on_exit(self) -> None:
         if messagebox.askokcancel("Exit", "Quit the application?"):
+            self.database.close()
             self.destroy()
 
     def _on_currency_change(self, symbol: str) -> None:
         self.currency_symbol = symbol
         # Update dependent tabs
+        # (tabs not built yet pick the symbol up when they are)
         self.products_tab.currency_symbol = symbol
-        self.transactions_tab.currency_symbol = symbol
-        self.reports_tab.currency_symbol = symbol
-        self.products_tab.refresh()
-        self.reports_tab.refresh()
+        for tab in (self.transactions_tab, self.reports_tab):
+            if tab is not None:
+                tab.currency_symbol = symbol
+        # Collapse quick successive changes into one redraw of whichever tab is showing;
+        # the others redraw when next selected
+        if self._pending_refresh is not None:
+            self.after_cancel(self._pending_refresh)
+        self._pending_refresh = self.after(CURRENCY_REFRESH_DELAY_MS, self._flush_refresh)
+
+    def _flush_refresh(self) -> None:
+        self._pending_refresh = None
+        self.products_tab._refresh_when_visible()
+        if self.reports_tab is not None:
+            self.reports_tab._refresh_when_visible()
 
 
 def main() -> None:
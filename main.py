@@ -6,21 +6,39 @@ Author: Sujal
 Created during BSc.IT studies
 """
 
-from db import Database
-from services import InventoryService
-import cli
+import sys
 
+# Accepted on the command line so scripted launches skip the prompt.
+MODE_ARGS = {"1": "1", "gui": "1", "--gui": "1", "2": "2", "cli": "2", "--cli": "2"}
 
-def main():
+
+def choose_mode(argv):
+    if argv:
+        choice = MODE_ARGS.get(argv[0].lower())
+        if choice is None:
+            sys.exit(f"Unknown mode {argv[0]!r}; use 'gui' or 'cli'.")
+        return choice
     print("Choose mode:")
     print("1) GUI (recommended)")
     print("2) Console (CLI)")
-    choice = input("Enter 1 or 2 (default 1): ").strip() or "1"
+    return input("Enter 1 or 2 (default 1): ").strip() or "1"
+
+
+def main(argv=None):
+    choice = choose_mode(sys.argv[1:] if argv is None else argv)
     if choice == "2":
+        # Imported here so the GUI launch doesn't pay for the console modules.
+        from db import Database
+        from services import InventoryService
+        import cli
+
         db = Database()
         db.init_db()
         service = InventoryService(db)
-        cli.run(service)
+        try:
+            cli.run(service)
+        finally:
+            db.close()
     else:
         from gui import main as gui_main
         gui_main()
@@ -2,10 +2,16 @@
 Business logic layer for Inventory Management System
 Author: Sujal (BSc.IT)
 """
-from typing import Any, Optional
-from db import Database, utc_now_iso
+import sqlite3
+from collections import namedtuple
+from typing import Any, Iterator, Optional
+from db import Database
 from dao import ProductDAO, SupplierDAO, PurchaseDAO, SaleDAO
 
+# Lightweight records for list views, in the column order of the DAOs' *_tuples queries
+Product = namedtuple("Product", "id name sku unit_price quantity_in_stock reorder_level")
+Supplier = namedtuple("Supplier", "id name contact_name phone email address")
+
 
 class InventoryService:
     def __init__(self, db: Database) -> None:
@@ -14,6 +20,44 @@ class InventoryService:
         self.suppliers = SupplierDAO(db)
         self.purchases = PurchaseDAO(db)
         self.sales = SaleDAO(db)
+        # list_products()/list_suppliers() results and their combobox labels are reused until a
+        # mutation through this service, or invalidate(), bumps the matching version
+        self._products_version = 0
+        self._products_cache: Optional[list[Product]] = None
+        self._product_choices: Optional[tuple[str, ...]] = None
+        self._product_by_id: dict[int, Optional[sqlite3.Row]] = {}
+        self._suppliers_version = 0
+        self._suppliers_cache: Optional[list[Supplier]] = None
+        self._supplier_choices: Optional[tuple[str, ...]] = None
+
+    @property
+    def products_version(self) -> int:
+        return self._products_version
+
+    @property
+    def suppliers_version(self) -> int:
+        return self._suppliers_version
+
+    def _products_changed(self) -> None:
+        self._products_version += 1
+        self._products_cache = None
+        self._product_choices = None
+        self._product_by_id.clear()
+
+    def _suppliers_changed(self) -> None:
+        self._suppliers_version += 1
+        self._suppliers_cache = None
+        self._supplier_choices = None
+
+    def invalidate(self) -> None:
+        """Drop every cached list and lookup, and bump both versions.
+
+        The caches only notice writes made through this service's own methods. Call this after
+        writing through the DAOs directly, or when another process (e.g. the CLI) may have
+        changed the database file.
+        """
+        self._products_changed()
+        self._suppliers_changed()
 
     # Products
     def add_product(self, name: str, sku: Optional[str], description: Optional[str], unit_price: float, reorder_level: int) -> int:
@@ -21,7 +65,9 @@ class InventoryService:
             raise ValueError("Unit price cannot be negative")
         if reorder_level < 0:
             raise ValueError("Reorder level cannot be negative")
-        return self.products.create(name, sku, description, unit_price, reorder_level)
+        product_id = self.products.create(name, sku, description, unit_price, reorder_level)
+        self._products_changed()
+        return product_id
 
     def update_product(self, product_id: int, **fields: Any) -> None:
         if "unit_price" in fields and fields["unit_price"] is not None and fields["unit_price"] < 0:
@@ -29,30 +75,69 @@ class InventoryService:
         if "reorder_level" in fields and fields["reorder_level"] is not None and fields["reorder_level"] < 0:
             raise ValueError("Reorder level cannot be negative")
         self.products.update(product_id, **fields)
+        self._products_changed()
 
     def delete_product(self, product_id: int) -> None:
         self.products.delete(product_id)
-
-    def list_products(self) -> list[dict[str, Any]]:
-        return self.products.list_all()
-
-    def get_product(self, product_id: int) -> Optional[dict[str, Any]]:
-        return self.products.get_by_id(product_id)
+        self._products_changed()
+
+    def list_products(self, q: Optional[str] = None) -> list[Product]:
+        """All products, cached until the next product change; treat the list as read-only
+
+        With q, only products whose name or SKU contains it, filtered by SQLite (not cached).
+        """
+        if q:
+            return list(map(Product._make, self.products.search_tuples(q)))
+        if self._products_cache is None:
+            self._products_cache = list(map(Product._make, self.products.list_all_tuples()))
+        return self._products_cache
+
+    def products_combobox_values(self) -> tuple[str, ...]:
+        """"id: name (SKU: sku)" labels for product pickers, cached like list_products()"""
+        if self._product_choices is None:
+            self._product_choices = tuple(
+                f"{pid}: {name} (SKU: {sku or '-'})" for pid, name, sku, *_ in self.list_products()
+            )
+        return self._product_choices
+
+    def iter_products(self) -> Iterator[sqlite3.Row]:
+        return self.products.iter_all()
+
+    def get_product(self, product_id: int) -> Optional[sqlite3.Row]:
+        """Product row by id, cached like list_products(); the Row is immutable, so sharing it is safe"""
+        try:
+            return self._product_by_id[product_id]
+        except KeyError:
+            product = self._product_by_id[product_id] = self.products.get_by_id(product_id)
+            return product
 
     # Suppliers
     def add_supplier(self, name: str, contact_name: Optional[str], phone: Optional[str], email: Optional[str], address: Optional[str]) -> int:
-        return self.suppliers.create(name, contact_name, phone, email, address)
+        supplier_id = self.suppliers.create(name, contact_name, phone, email, address)
+        self._suppliers_changed()
+        return supplier_id
 
     def update_supplier(self, supplier_id: int, **fields: Any) -> None:
         self.suppliers.update(supplier_id, **fields)
+        self._suppliers_changed()
 
     def delete_supplier(self, supplier_id: int) -> None:
         self.suppliers.delete(supplier_id)
+        self._suppliers_changed()
 
-    def list_suppliers(self) -> list[dict[str, Any]]:
-        return self.suppliers.list_all()
+    def list_suppliers(self) -> list[Supplier]:
+        """All suppliers, cached until the next supplier change; treat the list as read-only"""
+        if self._suppliers_cache is None:
+            self._suppliers_cache = list(map(Supplier._make, self.suppliers.list_all_tuples()))
+        return self._suppliers_cache
 
-    def get_supplier(self, supplier_id: int) -> Optional[dict[str, Any]]:
+    def suppliers_combobox_values(self) -> tuple[str, ...]:
+        """"id: name" labels for supplier pickers, cached like list_suppliers()"""
+        if self._supplier_choices is None:
+            self._supplier_choices = tuple(f"{sid}: {name}" for sid, name, *_ in self.list_suppliers())
+        return self._supplier_choices
+
+    def get_supplier(self, supplier_id: int) -> Optional[sqlite3.Row]:
         return self.suppliers.get_by_id(supplier_id)
 
     # Transactions
@@ -61,13 +146,15 @@ class InventoryService:
             raise ValueError("Quantity must be positive")
         if unit_cost < 0:
             raise ValueError("Unit cost cannot be negative")
-        product = self.products.get_by_id(product_id)
-        if product is None:
-            raise ValueError("Product not found")
-        if supplier_id is not None and self.suppliers.get_by_id(supplier_id) is None:
-            raise ValueError("Supplier not found")
-        purchase_id = self.purchases.create(product_id, supplier_id, quantity, unit_cost, utc_now_iso())
-        self.products.adjust_stock(product_id, quantity)
+        with self.db.transaction():
+            # adjust_stock raises "Product not found" before anything is written; the supplier is
+            # checked by its foreign key on insert instead of a separate lookup
+            self.products.adjust_stock(product_id, quantity)
+            try:
+                purchase_id = self.purchases.create(product_id, supplier_id, quantity, unit_cost)
+            except sqlite3.IntegrityError:
+                raise ValueError("Supplier not found") from None
+        self._products_changed()  # stock level moved
         return purchase_id
 
     def record_sale(self, product_id: int, quantity: int, unit_price: float, customer_name: Optional[str] = None, notes: Optional[str] = None) -> int:
@@ -75,26 +162,92 @@ class InventoryService:
             raise ValueError("Quantity must be positive")
         if unit_price < 0:
             raise ValueError("Unit price cannot be negative")
-        product = self.products.get_by_id(product_id)
-        if product is None:
-            raise ValueError("Product not found")
-        sale_id = self.sales.create(product_id, quantity, unit_price, utc_now_iso(), customer_name, notes)
-        self.products.adjust_stock(product_id, -quantity)
+        with self.db.transaction():
+            # Stock is checked and decremented first so a failed sale leaves no sales row behind
+            self.products.adjust_stock(product_id, -quantity)
+            sale_id = self.sales.create(product_id, quantity, unit_price, None, customer_name, notes)
+        self._products_changed()  # stock level moved
         return sale_id
 
+    @staticmethod
+    def _summed_deltas(entries, sign: int) -> dict[int, int]:
+        deltas: dict[int, int] = {}
+        for product_id, quantity, *_ in entries:
+            deltas[product_id] = deltas.get(product_id, 0) + sign * quantity
+        return deltas
+
+    def record_purchases_bulk(self, entries: list[tuple[int, int, float, Optional[int]]]) -> int:
+        """Record (product_id, quantity, unit_cost, supplier_id) purchases in one transaction.
+
+        All or nothing: any invalid entry rolls the whole batch back.
+        """
+        for _, quantity, unit_cost, _ in entries:
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            if unit_cost < 0:
+                raise ValueError("Unit cost cannot be negative")
+        if not entries:
+            return 0
+        with self.db.transaction():
+            # One UPDATE per product however many rows it has in the batch
+            self.products.adjust_stock_many(self._summed_deltas(entries, 1))
+            try:
+                count = self.purchases.create_many(
+                    [(product_id, supplier_id, quantity, unit_cost, None) for product_id, quantity, unit_cost, supplier_id in entries]
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError("Supplier not found") from None
+        self._products_changed()
+        return count
+
+    def record_sales_bulk(self, entries: list[tuple[int, int, float, Optional[str], Optional[str]]]) -> int:
+        """Record (product_id, quantity, unit_price, customer_name, notes) sales in one transaction.
+
+        All or nothing: any invalid entry, or not enough stock for the batch, rolls it all back.
+        """
+        for _, quantity, unit_price, _, _ in entries:
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            if unit_price < 0:
+                raise ValueError("Unit price cannot be negative")
+        if not entries:
+            return 0
+        with self.db.transaction():
+            self.products.adjust_stock_many(self._summed_deltas(entries, -1))
+            count = self.sales.create_many(
+                [(product_id, quantity, unit_price, None, customer_name, notes) for product_id, quantity, unit_price, customer_name, notes in entries]
+            )
+        self._products_changed()
+        return count
+
     # Reports
-    def report_stock_levels(self) -> list[dict[str, Any]]:
-        return self.products.list_all()
+    def report_stock_levels(self) -> list[Product]:
+        return self.list_products()
 
-    def report_low_stock(self) -> list[dict[str, Any]]:
-        products = self.products.list_all()
-        return [p for p in products if int(p["quantity_in_stock"]) <= int(p["reorder_level"])]
+    def report_low_stock(self) -> list[Product]:
+        return list(map(Product._make, self.products.list_low_stock_tuples()))
 
-    def report_sales_summary(self) -> list[dict[str, Any]]:
+    def report_sales_summary(self) -> list[sqlite3.Row]:
         return self.sales.sales_summary()
 
-    def report_sales_between(self, start_iso: str, end_iso: str) -> list[dict[str, Any]]:
+    def report_sales_between(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
         return self.sales.list_between(start_iso, end_iso)
 
-    def report_purchases_between(self, start_iso: str, end_iso: str) -> list[dict[str, Any]]:
-        return self.purchases.list_between(start_iso, end_iso) 
\ No newline at end of file
+    def iter_sales_between(self, start_iso: str, end_iso: str) -> Iterator[sqlite3.Row]:
+        return self.sales.iter_between(start_iso, end_iso)
+
+    def report_sales_daily(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
+        return self.sales.summary_between(start_iso, end_iso)
+
+    def report_purchases_between(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
+        return self.purchases.list_between(start_iso, end_iso)
+
+    def iter_purchases_between(self, start_iso: str, end_iso: str) -> Iterator[sqlite3.Row]:
+        return self.purchases.iter_between(start_iso, end_iso)
+
+    def report_purchases_daily(self, start_iso: str, end_iso: str) -> list[sqlite3.Row]:
+        return self.purchases.summary_between(start_iso, end_iso)
+
+    # Maintenance
+    def backup_database(self, target_path: str) -> None:
+        self.db.backup(target_path) 
\ No newline at end of file
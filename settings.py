@@ -0,0 +1,38 @@
+"""
+Settings file handling shared by the GUI and the CLI
+Author: Sujal (BSc.IT)
+"""
+import json
+import os
+from pathlib import Path
+
+SETTINGS_FILE = Path(__file__).with_name("settings.json")
+
+# Parsed settings are kept in memory and only re-read when the file's mtime changes
+_SETTINGS_CACHE = {"mtime": 0.0, "data": None}
+
+
+def load_settings() -> dict:
+    """Current settings as a fresh dict the caller may change before save_settings()"""
+    try:
+        mtime = SETTINGS_FILE.stat().st_mtime
+    except OSError:
+        return {}
+    if _SETTINGS_CACHE["data"] is None or _SETTINGS_CACHE["mtime"] != mtime:
+        try:
+            data = json.loads(SETTINGS_FILE.read_text(encoding="utf-8"))
+        except Exception:
+            data = {}
+        _SETTINGS_CACHE["mtime"] = mtime
+        _SETTINGS_CACHE["data"] = data
+    # A copy, so edits that never make it to disk can't leak into the cache
+    return dict(_SETTINGS_CACHE["data"])
+
+
+def save_settings(settings: dict) -> None:
+    # Write to a temp file and swap it in so a crash never leaves a half-written settings.json
+    tmp_file = SETTINGS_FILE.with_suffix(".json.tmp")
+    tmp_file.write_text(json.dumps(settings, indent=2), encoding="utf-8")
+    os.replace(tmp_file, SETTINGS_FILE)
+    _SETTINGS_CACHE["mtime"] = SETTINGS_FILE.stat().st_mtime
+    _SETTINGS_CACHE["data"] = dict(settings)